@@ -0,0 +1,740 @@
+"""
+Benchmarks for the bundled ``jwt`` package.
+
+Measures throughput and latency percentiles of encode/decode for every
+algorithm in ``get_default_algorithms()``, across token sizes, with and
+without claim validation and with PyJWK or raw keys, plus JWKS lookups
+against a local stub server and the batch, cache, codec, HMAC and
+revocation paths.
+
+Usage::
+
+    python bench_jwt.py --json results.json
+    python bench_jwt.py --jwt-path /path/to/old/JsonWebToken --json old.json
+    python bench_jwt.py --compare old.json results.json
+
+``--jwt-path`` selects the directory containing the ``jwt`` package to
+benchmark (by default the one next to this directory), so two versions can
+be measured with the same script. Cases using features the selected version
+doesn't have are skipped.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable
+
+DEFAULT_JWT_PATH = Path(__file__).resolve().parent.parent
+
+# Claims of each token size; "large" embeds a device permission list.
+TOKEN_SIZES = {
+    "small": 0,
+    "medium": 40,
+    "large": 600,
+}
+
+ISSUER = "https://auth.example.com"
+AUDIENCE = "api"
+
+
+def measure(
+    func: Callable[[], Any],
+    duration: float,
+    min_iterations: int = 5,
+    max_iterations: int = 1_000_000,
+) -> dict[str, Any]:
+    """
+    Calls ``func`` repeatedly for about ``duration`` seconds and returns the
+    throughput and latency percentiles, in microseconds.
+    """
+    func()  # warm up caches and lazy imports
+    perf_counter_ns = time.perf_counter_ns
+    samples: list[int] = []
+    append = samples.append
+    deadline = perf_counter_ns() + int(duration * 1e9)
+    total_start = perf_counter_ns()
+    while len(samples) < max_iterations:
+        start = perf_counter_ns()
+        func()
+        end = perf_counter_ns()
+        append(end - start)
+        if end >= deadline and len(samples) >= min_iterations:
+            break
+    total = (perf_counter_ns() - total_start) / 1e9
+
+    samples.sort()
+    n = len(samples)
+
+    def pct(p: float) -> float:
+        return samples[min(n - 1, max(0, -(-n * p // 100) - 1))] / 1e3
+
+    return {
+        "iterations": n,
+        "ops_per_sec": n / total,
+        "mean_us": sum(samples) / n / 1e3,
+        "p50_us": pct(50),
+        "p90_us": pct(90),
+        "p99_us": pct(99),
+        "max_us": samples[-1] / 1e3,
+    }
+
+
+class Runner:
+    def __init__(self, jwt: Any, duration: float, pattern: str | None) -> None:
+        self.jwt = jwt
+        self.duration = duration
+        self.pattern = re.compile(pattern) if pattern else None
+        self.results: list[dict[str, Any]] = []
+
+    def wanted(self, name: str) -> bool:
+        return self.pattern is None or self.pattern.search(name) is not None
+
+    def run(
+        self,
+        name: str,
+        func: Callable[[], Any],
+        duration: float | None = None,
+        **params: Any,
+    ) -> None:
+        if not self.wanted(name):
+            return
+        try:
+            stats = measure(func, self.duration if duration is None else duration)
+        except Exception as e:
+            result = {"name": name, "params": params, "error": repr(e)}
+            print(f"{name:<58} error: {e!r}", file=sys.stderr)
+        else:
+            result = {"name": name, "params": params, **stats}
+            print(
+                f"{name:<58}{stats['ops_per_sec']:>12.0f}/s"
+                f"{stats['p50_us']:>10.1f}{stats['p99_us']:>10.1f}",
+                file=sys.stderr,
+            )
+        self.results.append(result)
+
+    def skip(self, name: str, reason: str) -> None:
+        if self.wanted(name):
+            print(f"{name:<58} skipped: {reason}", file=sys.stderr)
+            self.results.append({"name": name, "skipped": reason})
+
+
+def make_keys(alg: str) -> tuple[Any, Any]:
+    """
+    Returns a (signing key, verification key) pair for ``alg``.
+    """
+    if alg == "none":
+        return None, None
+    if alg.startswith("HS"):
+        secret = os.urandom(64)
+        return secret, secret
+
+    from cryptography.hazmat.primitives.asymmetric import ec, ed448, ed25519, rsa
+
+    if alg.startswith(("RS", "PS")):
+        key: Any = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    elif alg.startswith("ES"):
+        curve = {
+            "ES256": ec.SECP256R1(),
+            "ES256K": ec.SECP256K1(),
+            "ES384": ec.SECP384R1(),
+            "ES512": ec.SECP521R1(),
+            "ES521": ec.SECP521R1(),
+        }[alg]
+        key = ec.generate_private_key(curve)
+    elif alg == "EdDSA":
+        key = ed25519.Ed25519PrivateKey.generate()
+    elif alg == "Ed448":
+        key = ed448.Ed448PrivateKey.generate()
+    else:
+        raise ValueError(f"no key generator for {alg}")
+    return key, key.public_key()
+
+
+def make_payload(size: str, now: int) -> dict[str, Any]:
+    payload: dict[str, Any] = {
+        "sub": "device-0001",
+        "iss": ISSUER,
+        "aud": AUDIENCE,
+        "iat": now,
+        "nbf": now,
+        "exp": now + 3600,
+        "jti": "2f1c6a4e-8b1d-4d7e-9a57-0c1b2e3f4a5b",
+    }
+    permissions = TOKEN_SIZES[size]
+    if permissions:
+        payload["permissions"] = [
+            f"device:{i:05d}:read,write,configure" for i in range(permissions)
+        ]
+    return payload
+
+
+def to_pyjwk(jwt: Any, alg: str, key: Any) -> Any:
+    alg_obj = jwt.get_algorithm_by_name(alg)
+    return jwt.PyJWK(alg_obj.to_jwk(key, as_dict=True), algorithm=alg)
+
+
+def bench_algorithms(runner: Runner) -> None:
+    jwt = runner.jwt
+    from jwt.algorithms import get_default_algorithms
+
+    now = int(time.time())
+    no_claims = {
+        "verify_exp": False,
+        "verify_nbf": False,
+        "verify_iat": False,
+        "verify_aud": False,
+        "verify_iss": False,
+        "verify_sub": False,
+        "verify_jti": False,
+    }
+
+    for alg in sorted(get_default_algorithms()):
+        try:
+            signing_key, verifying_key = make_keys(alg)
+        except Exception as e:
+            runner.skip(f"alg/{alg}", repr(e))
+            continue
+
+        key_inputs: dict[str, tuple[Any, Any]] = {"raw": (signing_key, verifying_key)}
+        if alg != "none":
+            try:
+                key_inputs["pyjwk"] = (
+                    to_pyjwk(jwt, alg, signing_key),
+                    to_pyjwk(jwt, alg, verifying_key),
+                )
+            except Exception as e:
+                runner.skip(f"alg/{alg}/pyjwk", repr(e))
+
+        for size in TOKEN_SIZES:
+            payload = make_payload(size, now)
+            token = jwt.encode(payload, signing_key, alg)
+            params = {"alg": alg, "size": size, "token_bytes": len(token)}
+
+            for key_kind, (sign_key, verify_key) in key_inputs.items():
+                runner.run(
+                    f"encode/{alg}/{size}/{key_kind}",
+                    lambda p=payload, k=sign_key, a=alg: jwt.encode(p, k, a),
+                    key=key_kind,
+                    **params,
+                )
+                verify_options = {"verify_signature": alg != "none"}
+                runner.run(
+                    f"decode/{alg}/{size}/{key_kind}/claims",
+                    lambda t=token, k=verify_key, a=alg, o=verify_options: jwt.decode(
+                        t,
+                        k,
+                        [a],
+                        options=o,
+                        audience=AUDIENCE,
+                        issuer=ISSUER,
+                    ),
+                    key=key_kind,
+                    claims=True,
+                    **params,
+                )
+                runner.run(
+                    f"decode/{alg}/{size}/{key_kind}/no-claims",
+                    lambda t=token, k=verify_key, a=alg, o=verify_options: jwt.decode(
+                        t, k, [a], options={**no_claims, **o}
+                    ),
+                    key=key_kind,
+                    claims=False,
+                    **params,
+                )
+
+
+class _JWKSHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    body = b"{}"
+    requests = 0
+
+    def do_GET(self) -> None:
+        type(self).requests += 1
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.send_header("ETag", '"v1"')
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", '"v1"')
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+def serve_jwks(jwks: dict[str, Any]) -> tuple[ThreadingHTTPServer, str]:
+    handler = type("JWKSHandler", (_JWKSHandler,), {"body": json.dumps(jwks).encode()})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/jwks.json"
+
+
+def bench_jwks(runner: Runner) -> None:
+    jwt = runner.jwt
+    from jwt.algorithms import RSAAlgorithm
+
+    signing_key, _ = make_keys("RS256")
+    for key_count in (1, 16, 128):
+        keys = []
+        for i in range(key_count):
+            jwk = RSAAlgorithm.to_jwk(signing_key.public_key(), as_dict=True)
+            jwk.update({"kid": f"key-{i}", "use": "sig", "alg": "RS256"})
+            keys.append(jwk)
+        jwks = {"keys": keys}
+        runner.run(
+            f"jwks/{key_count}-keys/parse-set",
+            lambda d=jwks: jwt.PyJWKSet.from_dict(d),
+            keys=key_count,
+        )
+        name = f"jwks/{key_count}-keys/parse-set-unchanged"
+        parsed = jwt.PyJWKSet.from_dict(jwks)
+        try:
+            jwt.PyJWKSet.from_dict(jwks, previous=parsed)
+        except TypeError:
+            runner.skip(name, "PyJWKSet.from_dict has no previous argument")
+        else:
+            runner.run(
+                name,
+                lambda d=jwks, p=parsed: jwt.PyJWKSet.from_dict(d, previous=p),
+                keys=key_count,
+            )
+        server, url = serve_jwks(jwks)
+        try:
+            kid = f"key-{key_count - 1}"
+            token = jwt.encode(
+                make_payload("small", int(time.time())),
+                signing_key,
+                "RS256",
+                headers={"kid": kid},
+            )
+            client = jwt.PyJWKClient(url)
+
+            runner.run(
+                f"jwks/{key_count}-keys/cached-lookup",
+                lambda c=client, t=token: c.get_signing_key_from_jwt(t),
+                keys=key_count,
+            )
+
+            def decode_with_jwks(c: Any = client, t: str = token) -> Any:
+                key = c.get_signing_key_from_jwt(t)
+                return jwt.decode(t, key, ["RS256"], audience=AUDIENCE, issuer=ISSUER)
+
+            runner.run(
+                f"jwks/{key_count}-keys/lookup-and-decode",
+                decode_with_jwks,
+                keys=key_count,
+            )
+            name = f"jwks/{key_count}-keys/router-decode"
+            if hasattr(jwt, "PyJWKRouter"):
+                router = jwt.PyJWKRouter(
+                    {ISSUER: url}, algorithms=["RS256"], audience=AUDIENCE
+                )
+                runner.run(name, lambda r=router, t=token: r.decode(t), keys=key_count)
+            else:
+                runner.skip(name, "jwt.PyJWKRouter not available")
+            runner.run(
+                f"jwks/{key_count}-keys/refresh",
+                lambda c=client: c.get_jwk_set(refresh=True),
+                duration=min(runner.duration, 0.5),
+                keys=key_count,
+            )
+            name = f"jwks/{key_count}-keys/refresh-keepalive"
+            transport_class = getattr(jwt.jwks_client, "KeepAliveTransport", None)
+            if transport_class is not None:
+                keepalive_client = jwt.PyJWKClient(url, transport=transport_class())
+                runner.run(
+                    name,
+                    lambda c=keepalive_client: c.get_jwk_set(refresh=True),
+                    duration=min(runner.duration, 0.5),
+                    keys=key_count,
+                )
+            else:
+                runner.skip(name, "jwt.jwks_client.KeepAliveTransport not available")
+            runner.run(
+                f"jwks/{key_count}-keys/cold-fetch",
+                lambda u=url, t=token: jwt.PyJWKClient(u).get_signing_key_from_jwt(t),
+                duration=min(runner.duration, 0.5),
+                keys=key_count,
+            )
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+def bench_batch_and_caches(runner: Runner) -> None:
+    jwt = runner.jwt
+    now = int(time.time())
+    secret = os.urandom(64)
+    rsa_key, rsa_public = make_keys("RS256")
+    payload = make_payload("small", now)
+    hs_token = jwt.encode(payload, secret, "HS256")
+    rs_token = jwt.encode(payload, rsa_key, "RS256")
+    claims = {"audience": AUDIENCE, "issuer": ISSUER}
+
+    for alg, token, key in (
+        ("HS256", hs_token, secret),
+        ("RS256", rs_token, rsa_public),
+    ):
+        if hasattr(jwt, "Verifier"):
+            verifier = jwt.Verifier(key, [alg], **claims)
+            runner.run(f"verifier/{alg}", lambda v=verifier, t=token: v.verify(t))
+        else:
+            runner.skip(f"verifier/{alg}", "jwt.Verifier not available")
+
+        if hasattr(jwt, "decode_many"):
+            tokens = [token] * 100
+            runner.run(
+                f"decode_many/{alg}/100-tokens",
+                lambda ts=tokens, k=key, a=alg: jwt.decode_many(ts, k, [a], **claims),
+                tokens=100,
+            )
+        else:
+            runner.skip(
+                f"decode_many/{alg}/100-tokens", "jwt.decode_many not available"
+            )
+
+        if hasattr(jwt, "VerifiedTokenCache"):
+            cached = jwt.PyJWT(token_cache=jwt.VerifiedTokenCache())
+            runner.run(
+                f"token_cache_hit/{alg}",
+                lambda c=cached, t=token, k=key, a=alg: c.decode(t, k, [a], **claims),
+            )
+        else:
+            runner.skip(
+                f"token_cache_hit/{alg}", "jwt.VerifiedTokenCache not available"
+            )
+
+    if hasattr(jwt, "encode_many"):
+        payloads = [dict(payload, sub=f"device-{i}") for i in range(500)]
+        for workers in sorted({1, os.cpu_count() or 1}):
+            runner.run(
+                f"encode_many/RS256/500-tokens/{workers}-workers",
+                lambda w=workers: jwt.encode_many(
+                    payloads, rsa_key, "RS256", workers=w
+                ),
+                duration=min(runner.duration, 1.0),
+                tokens=len(payloads),
+                workers=workers,
+            )
+    else:
+        runner.skip("encode_many", "jwt.encode_many not available")
+
+
+def bench_codecs(runner: Runner) -> None:
+    try:
+        from jwt import json_codecs
+    except ImportError:
+        runner.skip("codec", "jwt.json_codecs not available")
+        return
+
+    payload = make_payload("large", int(time.time()))
+    for cls_name in ("JSONCodec", "OrjsonCodec", "MsgspecCodec"):
+        try:
+            codec = getattr(json_codecs, cls_name)()
+        except ImportError as e:
+            runner.skip(f"codec/{cls_name}", repr(e))
+            continue
+        data = codec.dumps(payload)
+        runner.run(f"codec/{codec.name}/dumps", lambda c=codec: c.dumps(payload))
+        runner.run(f"codec/{codec.name}/loads", lambda c=codec, d=data: c.loads(d))
+
+
+def bench_hmac(runner: Runner) -> None:
+    import hashlib
+    import hmac
+
+    from jwt.algorithms import HMACAlgorithm
+
+    key = os.urandom(32)
+    msg = os.urandom(300)
+    alg = HMACAlgorithm(hashlib.sha256)
+    runner.run("hmac/sha256/HMACAlgorithm.sign", lambda: alg.sign(msg, key))
+    runner.run(
+        "hmac/sha256/hmac.new",
+        lambda: hmac.new(key, msg, hashlib.sha256).digest(),
+    )
+
+
+def bench_ec_signatures(runner: Runner) -> None:
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.asymmetric import ec
+
+    from jwt import utils
+
+    for curve in (ec.SECP256R1(), ec.SECP384R1(), ec.SECP521R1()):
+        key = ec.generate_private_key(curve)
+        der_sig = key.sign(b"payload", ec.ECDSA(hashes.SHA256()))
+        raw_sig = utils.der_to_raw_signature(der_sig, curve)
+        runner.run(
+            f"ec_signature/{curve.name}/der_to_raw",
+            lambda d=der_sig, c=curve: utils.der_to_raw_signature(d, c),
+        )
+        runner.run(
+            f"ec_signature/{curve.name}/raw_to_der",
+            lambda r=raw_sig, c=curve: utils.raw_to_der_signature(r, c),
+        )
+        name = f"ec_signature/{curve.name}/der_to_raw_batch/100"
+        if hasattr(utils, "der_to_raw_signatures"):
+            runner.run(
+                name,
+                lambda d=[der_sig] * 100, c=curve: utils.der_to_raw_signatures(d, c),
+                tokens=100,
+            )
+        else:
+            runner.skip(name, "utils.der_to_raw_signatures not available")
+
+
+def bench_memory(runner: Runner) -> None:
+    """
+    Measures the Python memory held per key by a PyJWKSet, with tracemalloc.
+    The JWKS document is parsed from JSON inside the measurement and dropped
+    before it ends, as after a refresh. Memory allocated by OpenSSL for the
+    key objects is not included.
+    """
+    import gc
+    import tracemalloc
+
+    jwt = runner.jwt
+    from jwt.algorithms import ECAlgorithm, RSAAlgorithm
+
+    key_count = 500
+    for alg, alg_class in (("RS256", RSAAlgorithm), ("ES256", ECAlgorithm)):
+        signing_key, _ = make_keys(alg)
+        jwk = alg_class.to_jwk(signing_key.public_key(), as_dict=True)
+        text = json.dumps(
+            {"keys": [{**jwk, "kid": f"key-{i}", "alg": alg} for i in range(key_count)]}
+        )
+        for keep_jwk_data in (True, False):
+            variant = "with-jwk" if keep_jwk_data else "without-jwk"
+            name = f"memory/{alg}/{key_count}-keys/{variant}"
+            if not runner.wanted(name):
+                continue
+            kwargs = {} if keep_jwk_data else {"keep_jwk_data": False}
+
+            gc.collect()
+            tracemalloc.start()
+            try:
+                doc = json.loads(text)
+                jwk_set = jwt.PyJWKSet.from_dict(doc, **kwargs)
+                del doc
+                gc.collect()
+                size = tracemalloc.get_traced_memory()[0]
+                del jwk_set
+            except TypeError:
+                runner.skip(name, "PyJWKSet.from_dict has no keep_jwk_data argument")
+                continue
+            finally:
+                tracemalloc.stop()
+
+            result = {
+                "name": name,
+                "params": {"keys": key_count},
+                "bytes_per_key": size / key_count,
+            }
+            print(f"{name:<58}{size / key_count:>10.0f} bytes/key", file=sys.stderr)
+            runner.results.append(result)
+
+
+def bench_revocation(runner: Runner) -> None:
+    jwt = runner.jwt
+    try:
+        from jwt import revocation
+    except ImportError:
+        runner.skip("revocation", "jwt.revocation not available")
+        return
+
+    expires_at = time.time() + 3600
+    store = revocation.ShardedRevocationStore()
+    front = revocation.BloomFilteredRevocationStore(revocation.ShardedRevocationStore())
+    for target in (store, front):
+        for i in range(100_000):
+            target.revoke(f"revoked-{i}", expires_at)
+
+    for variant, target in (("sharded", store), ("bloom-sharded", front)):
+        runner.run(
+            f"revocation/{variant}/not-revoked",
+            lambda t=target: t.is_revoked("2f1c6a4e-8b1d-4d7e-9a57-0c1b2e3f4a5b"),
+            revoked=100_000,
+        )
+        runner.run(
+            f"revocation/{variant}/revoked",
+            lambda t=target: t.is_revoked("revoked-5000"),
+            revoked=100_000,
+        )
+
+    secret = os.urandom(64)
+    token = jwt.encode(make_payload("small", int(time.time())), secret, "HS256")
+    claims = {"audience": AUDIENCE, "issuer": ISSUER}
+    checked = jwt.PyJWT(revocation_store=store)
+    runner.run(
+        "revocation/decode/HS256",
+        lambda: checked.decode(token, secret, ["HS256"], **claims),
+        revoked=100_000,
+    )
+
+
+def bench_import(runner: Runner, jwt_path: Path) -> None:
+    """
+    Measures ``import jwt`` in a fresh interpreter, net of interpreter
+    startup. Reported as the best (p0) and median of the runs.
+    """
+    name = "import/jwt"
+    if not runner.wanted(name):
+        return
+
+    def run(code: str) -> float:
+        env = {**os.environ, "PYTHONPATH": str(jwt_path)}
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True, env=env)
+        return time.perf_counter() - start
+
+    baseline = sorted(run("pass") for _ in range(7))
+    samples = sorted(run("import jwt") for _ in range(7))
+    net = [(s - baseline[0]) * 1e6 for s in samples]
+    result = {
+        "name": name,
+        "params": {},
+        "iterations": len(net),
+        "best_us": net[0],
+        "p50_us": net[len(net) // 2],
+    }
+    print(
+        f"{name:<58}{'':>14}{net[0]:>10.0f}{net[len(net) // 2]:>10.0f}",
+        file=sys.stderr,
+    )
+    runner.results.append(result)
+
+
+def compare(base_path: str, new_path: str, threshold: float) -> int:
+    """
+    Prints the p50 latency (or, for memory cases, bytes per key) ratio
+    (new / base) of the cases present in both files, and returns 1 if any
+    case regressed by more than ``threshold``.
+    """
+    with open(base_path) as f:
+        base = {r["name"]: r for r in json.load(f)["results"]}
+    with open(new_path) as f:
+        new = {r["name"]: r for r in json.load(f)["results"]}
+
+    regressed = False
+    print(f"{'case':<58}{'base':>12}{'new':>12}{'ratio':>8}")
+    for name, result in new.items():
+        old = base.get(name)
+        if not old:
+            continue
+        metric = next(
+            (m for m in ("p50_us", "bytes_per_key") if m in old and m in result),
+            None,
+        )
+        if metric is None:
+            continue
+        ratio = result[metric] / old[metric] if old[metric] else float("inf")
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  REGRESSION"
+            regressed = True
+        print(
+            f"{name:<58}{old[metric]:>12.1f}{result[metric]:>12.1f}{ratio:>8.2f}{flag}"
+        )
+    return 1 if regressed else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--jwt-path",
+        default=str(DEFAULT_JWT_PATH),
+        help="directory containing the jwt package to benchmark",
+    )
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=0.3,
+        help="seconds spent on each case (default: %(default)s)",
+    )
+    parser.add_argument("--filter", help="only run cases whose name matches this regex")
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument(
+        "--compare",
+        nargs=2,
+        metavar=("BASE", "NEW"),
+        help="compare two result files instead of running",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="p50 slowdown reported as a regression by --compare",
+    )
+    args = parser.parse_args()
+
+    if args.compare:
+        return compare(args.compare[0], args.compare[1], args.threshold)
+
+    jwt_path = Path(args.jwt_path).resolve()
+    sys.path.insert(0, str(jwt_path))
+    import jwt
+
+    runner = Runner(jwt, args.duration, args.filter)
+    print(
+        f"{'case':<58}{'throughput':>14}{'p50 us':>10}{'p99 us':>10}",
+        file=sys.stderr,
+    )
+    bench_import(runner, jwt_path)
+    bench_algorithms(runner)
+    bench_jwks(runner)
+    bench_batch_and_caches(runner)
+    bench_codecs(runner)
+    bench_hmac(runner)
+    bench_ec_signatures(runner)
+    bench_memory(runner)
+    bench_revocation(runner)
+
+    try:
+        import cryptography
+
+        cryptography_version = cryptography.__version__
+    except ImportError:
+        cryptography_version = None
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(tz=timezone.utc).isoformat(),
+            "jwt_version": getattr(jwt, "__version__", None),
+            "jwt_path": str(jwt_path),
+            "python": sys.version,
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+            "cryptography": cryptography_version,
+            "duration": args.duration,
+        },
+        "results": runner.results,
+    }
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
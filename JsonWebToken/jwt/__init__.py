@@ -1,3 +1,5 @@
+from typing import Any
+
 from .api_jwk import PyJWK, PyJWKSet
 from .api_jws import (
     PyJWS,
@@ -6,7 +8,15 @@ from .api_jws import (
     register_algorithm,
     unregister_algorithm,
 )
-from .api_jwt import PyJWT, decode, decode_complete, encode
+from .api_jwt import (
+    PyJWT,
+    decode,
+    decode_complete,
+    decode_complete_many,
+    decode_many,
+    encode,
+    encode_many,
+)
 from .exceptions import (
     DecodeError,
     ExpiredSignatureError,
@@ -24,8 +34,24 @@ from .exceptions import (
     PyJWKError,
     PyJWKSetError,
     PyJWTError,
+    RevokedTokenError,
 )
+from .json_codecs import JSONCodec
 from .jwks_client import PyJWKClient
+from .jwks_router import PyJWKRouter
+from .revocation import ShardedRevocationStore
+from .token_cache import VerifiedTokenCache
+from .verifier import Verifier
+
+
+def __getattr__(name: str) -> Any:
+    # Imported on first use, so ``import jwt`` doesn't pull in asyncio.
+    if name == "AsyncPyJWKClient":
+        from .async_jwks_client import AsyncPyJWKClient
+
+        return AsyncPyJWKClient
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __version__ = "2.10.1"
 
@@ -46,11 +72,20 @@ __all__ = [
     "PyJWS",
     "PyJWT",
     "PyJWKClient",
+    "PyJWKRouter",
+    "AsyncPyJWKClient",
     "PyJWK",
     "PyJWKSet",
+    "JSONCodec",
+    "Verifier",
+    "VerifiedTokenCache",
+    "ShardedRevocationStore",
     "decode",
     "decode_complete",
+    "decode_complete_many",
+    "decode_many",
     "encode",
+    "encode_many",
     "get_unverified_header",
     "register_algorithm",
     "unregister_algorithm",
@@ -72,4 +107,5 @@ __all__ = [
     "PyJWKError",
     "PyJWKSetError",
     "PyJWTError",
+    "RevokedTokenError",
 ]
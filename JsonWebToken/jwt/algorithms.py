@@ -2,40 +2,43 @@ from __future__ import annotations
 
 import hashlib
 import hmac
+import importlib
+import importlib.util
 import json
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, Any, ClassVar, Literal, NoReturn, cast, overload
+from collections.abc import Iterable, Iterator
+from typing import TYPE_CHECKING, Any, ClassVar, Literal, NoReturn, overload
 
 from .exceptions import InvalidKeyError
-from .types import HashlibHash, JWKDict
+from .key_cache import PreparedKeyCache
+from .types import HashlibHash, JWKDict, PayloadChunk
 from .utils import (
     base64url_decode,
     base64url_encode,
-    der_to_raw_signature,
     force_bytes,
-    from_base64url_uint,
     is_pem_format,
     is_ssh_key,
-    raw_to_der_signature,
-    to_base64url_uint,
 )
 
-try:
-    from cryptography.exceptions import InvalidSignature, UnsupportedAlgorithm
-    from cryptography.hazmat.backends import default_backend
-    from cryptography.hazmat.primitives import hashes
-    from cryptography.hazmat.primitives.asymmetric import padding
+# cryptography is only imported when an algorithm that needs it is first
+# used, so ``import jwt`` stays cheap.
+has_crypto = importlib.util.find_spec("cryptography") is not None
+
+# Classes defined in ._crypto_algorithms, resolved lazily by __getattr__.
+_crypto_names = {"RSAAlgorithm", "RSAPSSAlgorithm", "ECAlgorithm", "OKPAlgorithm"}
+
+
+def __getattr__(name: str) -> Any:
+    if has_crypto and name in _crypto_names:
+        module = importlib.import_module("._crypto_algorithms", __package__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+if TYPE_CHECKING:
     from cryptography.hazmat.primitives.asymmetric.ec import (
-        ECDSA,
-        SECP256K1,
-        SECP256R1,
-        SECP384R1,
-        SECP521R1,
-        EllipticCurve,
         EllipticCurvePrivateKey,
-        EllipticCurvePrivateNumbers,
         EllipticCurvePublicKey,
-        EllipticCurvePublicNumbers,
     )
     from cryptography.hazmat.primitives.asymmetric.ed448 import (
         Ed448PrivateKey,
@@ -47,30 +50,9 @@ try:
     )
     from cryptography.hazmat.primitives.asymmetric.rsa import (
         RSAPrivateKey,
-        RSAPrivateNumbers,
         RSAPublicKey,
-        RSAPublicNumbers,
-        rsa_crt_dmp1,
-        rsa_crt_dmq1,
-        rsa_crt_iqmp,
-        rsa_recover_prime_factors,
-    )
-    from cryptography.hazmat.primitives.serialization import (
-        Encoding,
-        NoEncryption,
-        PrivateFormat,
-        PublicFormat,
-        load_pem_private_key,
-        load_pem_public_key,
-        load_ssh_public_key,
     )
 
-    has_crypto = True
-except ModuleNotFoundError:
-    has_crypto = False
-
-
-if TYPE_CHECKING:
     # Type aliases for convenience in algorithms method signatures
     AllowedRSAKeys = RSAPrivateKey | RSAPublicKey
     AllowedECKeys = EllipticCurvePrivateKey | EllipticCurvePublicKey
@@ -101,39 +83,169 @@ requires_cryptography = {
     "EdDSA",
 }
 
+# Prepared asymmetric keys parsed from PEM/SSH input, shared by all algorithm
+# instances. Set ``prepared_key_cache.enabled = False`` to turn it off.
+prepared_key_cache = PreparedKeyCache()
+
+
+# alg name -> (class name, hash attribute) of the algorithms implemented by
+# the library. Instances are created on first use and shared.
+_default_algorithm_specs: dict[str, tuple[str, str | None]] = {
+    "none": ("NoneAlgorithm", None),
+    "HS256": ("HMACAlgorithm", "SHA256"),
+    "HS384": ("HMACAlgorithm", "SHA384"),
+    "HS512": ("HMACAlgorithm", "SHA512"),
+    "RS256": ("RSAAlgorithm", "SHA256"),
+    "RS384": ("RSAAlgorithm", "SHA384"),
+    "RS512": ("RSAAlgorithm", "SHA512"),
+    "ES256": ("ECAlgorithm", "SHA256"),
+    "ES256K": ("ECAlgorithm", "SHA256"),
+    "ES384": ("ECAlgorithm", "SHA384"),
+    "ES521": ("ECAlgorithm", "SHA512"),
+    "ES512": ("ECAlgorithm", "SHA512"),  # Backward compat for #219 fix
+    "PS256": ("RSAPSSAlgorithm", "SHA256"),
+    "PS384": ("RSAPSSAlgorithm", "SHA384"),
+    "PS512": ("RSAPSSAlgorithm", "SHA512"),
+    "EdDSA": ("OKPAlgorithm", None),
+}
+_default_algorithm_instances: dict[str, Algorithm] = {}
+
+
+def _default_algorithm_names() -> list[str]:
+    return [
+        name
+        for name in _default_algorithm_specs
+        if has_crypto or name not in requires_cryptography
+    ]
+
+
+def get_default_algorithm(alg_name: str) -> Algorithm:
+    """
+    Returns the shared instance of a default algorithm, creating it (and
+    importing cryptography if it needs it) on first use.
+
+    Raises KeyError if the algorithm is not implemented by the library.
+    """
+    try:
+        return _default_algorithm_instances[alg_name]
+    except KeyError:
+        pass
+
+    if not has_crypto and alg_name in requires_cryptography:
+        raise KeyError(alg_name)
 
-def get_default_algorithms() -> dict[str, Algorithm]:
+    class_name, hash_attr = _default_algorithm_specs[alg_name]
+    if class_name in _crypto_names:
+        alg_class = __getattr__(class_name)
+    else:
+        alg_class = globals()[class_name]
+
+    if hash_attr is None:
+        alg_obj = alg_class()
+    else:
+        alg_obj = alg_class(getattr(alg_class, hash_attr))
+
+    return _default_algorithm_instances.setdefault(alg_name, alg_obj)
+
+
+def get_default_algorithms() -> LazyAlgorithmDict:
     """
     Returns the algorithms that are implemented by the library.
     """
-    default_algorithms = {
-        "none": NoneAlgorithm(),
-        "HS256": HMACAlgorithm(HMACAlgorithm.SHA256),
-        "HS384": HMACAlgorithm(HMACAlgorithm.SHA384),
-        "HS512": HMACAlgorithm(HMACAlgorithm.SHA512),
-    }
-
-    if has_crypto:
-        default_algorithms.update(
-            {
-                "RS256": RSAAlgorithm(RSAAlgorithm.SHA256),
-                "RS384": RSAAlgorithm(RSAAlgorithm.SHA384),
-                "RS512": RSAAlgorithm(RSAAlgorithm.SHA512),
-                "ES256": ECAlgorithm(ECAlgorithm.SHA256),
-                "ES256K": ECAlgorithm(ECAlgorithm.SHA256),
-                "ES384": ECAlgorithm(ECAlgorithm.SHA384),
-                "ES521": ECAlgorithm(ECAlgorithm.SHA512),
-                "ES512": ECAlgorithm(
-                    ECAlgorithm.SHA512
-                ),  # Backward compat for #219 fix
-                "PS256": RSAPSSAlgorithm(RSAPSSAlgorithm.SHA256),
-                "PS384": RSAPSSAlgorithm(RSAPSSAlgorithm.SHA384),
-                "PS512": RSAPSSAlgorithm(RSAPSSAlgorithm.SHA512),
-                "EdDSA": OKPAlgorithm(),
-            }
-        )
-
-    return default_algorithms
+    return LazyAlgorithmDict(_default_algorithm_names())
+
+
+class LazyAlgorithmDict(dict[str, "Algorithm"]):
+    """
+    dict of alg name to Algorithm, where default algorithms are only
+    instantiated when they are looked up.
+    """
+
+    # Unresolved default algorithms are stored as None; every method that
+    # reads values resolves them first.
+
+    def __init__(
+        self,
+        default_names: Iterable[str] = (),
+        algorithms: dict[str, Algorithm | None] | None = None,
+    ) -> None:
+        super().__init__()
+        entries: dict[Any, Any] = dict.fromkeys(default_names)
+        if algorithms:
+            entries.update(algorithms)
+        dict.update(self, entries)
+
+    def __getitem__(self, alg_name: str) -> Algorithm:
+        alg_obj: Algorithm | None = super().__getitem__(alg_name)
+        if alg_obj is None:
+            alg_obj = get_default_algorithm(alg_name)
+            super().__setitem__(alg_name, alg_obj)
+        return alg_obj
+
+    def __iter__(self) -> Iterator[str]:
+        # Overridden so dict(self) and {**self} copy through __getitem__
+        # instead of the unresolved values.
+        return super().__iter__()
+
+    def _resolve_all(self) -> None:
+        for alg_name in self:
+            self[alg_name]
+
+    def get(self, alg_name: str, default: Any = None) -> Any:  # type: ignore[override]
+        return self[alg_name] if alg_name in self else default
+
+    def setdefault(self, alg_name: str, default: Algorithm) -> Algorithm:  # type: ignore[override]
+        if alg_name in self:
+            return self[alg_name]
+        return super().setdefault(alg_name, default)
+
+    def pop(self, alg_name: str, *default: Any) -> Any:  # type: ignore[override]
+        if alg_name in self:
+            alg_obj = self[alg_name]
+            super().__delitem__(alg_name)
+            return alg_obj
+        return super().pop(alg_name, *default)
+
+    def popitem(self) -> tuple[str, Algorithm]:
+        self._resolve_all()
+        return super().popitem()
+
+    def values(self) -> Any:
+        self._resolve_all()
+        return super().values()
+
+    def items(self) -> Any:
+        self._resolve_all()
+        return super().items()
+
+    def __eq__(self, other: object) -> bool:
+        self._resolve_all()
+        return super().__eq__(other)
+
+    def __ne__(self, other: object) -> bool:
+        return not self == other
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        self._resolve_all()
+        return super().__repr__()
+
+    def __or__(self, other: Any) -> Any:
+        if not isinstance(other, dict):
+            return NotImplemented
+        merged = self.copy()
+        merged.update(other)
+        return merged
+
+    def __ror__(self, other: Any) -> Any:
+        if not isinstance(other, dict):
+            return NotImplemented
+        self._resolve_all()
+        return {**other, **dict(super().items())}
+
+    def copy(self) -> LazyAlgorithmDict:
+        return LazyAlgorithmDict(algorithms=dict(super().items()))
 
 
 class Algorithm(ABC):
@@ -152,11 +264,11 @@ class Algorithm(ABC):
         if hash_alg is None:
             raise NotImplementedError
 
-        if (
-            has_crypto
-            and isinstance(hash_alg, type)
-            and issubclass(hash_alg, hashes.HashAlgorithm)
-        ):
+        if isinstance(hash_alg, type):
+            # A cryptography HashAlgorithm, so cryptography is already loaded.
+            from cryptography.hazmat.backends import default_backend
+            from cryptography.hazmat.primitives import hashes
+
             digest = hashes.Hash(hash_alg(), backend=default_backend())
             digest.update(bytestr)
             return bytes(digest.finalize())
@@ -184,6 +296,27 @@ class Algorithm(ABC):
         for the specified message and key values.
         """
 
+    def sign_stream(self, chunks: Iterable[PayloadChunk], key: Any) -> bytes:
+        """
+        Like sign(), for a message given as an iterable of byte chunks, which
+        are hashed as they are read.
+
+        Raises NotImplementedError for algorithms that need the whole message
+        at once (EdDSA).
+        """
+        raise NotImplementedError
+
+    def verify_stream(
+        self, chunks: Iterable[PayloadChunk], key: Any, sig: bytes
+    ) -> bool:
+        """
+        Like verify(), for a message given as an iterable of byte chunks.
+
+        Raises NotImplementedError for algorithms that need the whole message
+        at once (EdDSA).
+        """
+        raise NotImplementedError
+
     @overload
     @staticmethod
     @abstractmethod
@@ -230,6 +363,14 @@ class NoneAlgorithm(Algorithm):
     def verify(self, msg: bytes, key: None, sig: bytes) -> bool:
         return False
 
+    def sign_stream(self, chunks: Iterable[PayloadChunk], key: None) -> bytes:
+        return b""
+
+    def verify_stream(
+        self, chunks: Iterable[PayloadChunk], key: None, sig: bytes
+    ) -> bool:
+        return False
+
     @staticmethod
     def to_jwk(key_obj: Any, as_dict: bool = False) -> NoReturn:
         raise NotImplementedError()
@@ -249,8 +390,12 @@ class HMACAlgorithm(Algorithm):
     SHA384: ClassVar[HashlibHash] = hashlib.sha384
     SHA512: ClassVar[HashlibHash] = hashlib.sha512
 
+    # Upper bound on the number of keys with a pre-keyed HMAC template.
+    max_templates: ClassVar[int] = 64
+
     def __init__(self, hash_alg: HashlibHash) -> None:
         self.hash_alg = hash_alg
+        self._templates: dict[bytes, hmac.HMAC] = {}
 
     def prepare_key(self, key: str | bytes) -> bytes:
         key_bytes = force_bytes(key)
@@ -304,572 +449,34 @@ class HMACAlgorithm(Algorithm):
 
         return base64url_decode(obj["k"])
 
+    def _new_mac(self, key: bytes) -> hmac.HMAC:
+        # Copying an HMAC that has already absorbed the key skips hashing the
+        # inner and outer padded keys again for every message.
+        if not isinstance(key, bytes):
+            return hmac.new(key, digestmod=self.hash_alg)
+        template = self._templates.get(key)
+        if template is None:
+            template = hmac.new(key, digestmod=self.hash_alg)
+            if len(self._templates) >= self.max_templates:
+                self._templates.clear()
+            self._templates[key] = template
+        return template.copy()
+
     def sign(self, msg: bytes, key: bytes) -> bytes:
-        return hmac.new(key, msg, self.hash_alg).digest()
+        mac = self._new_mac(key)
+        mac.update(msg)
+        return mac.digest()
 
     def verify(self, msg: bytes, key: bytes, sig: bytes) -> bool:
         return hmac.compare_digest(sig, self.sign(msg, key))
 
+    def sign_stream(self, chunks: Iterable[PayloadChunk], key: bytes) -> bytes:
+        mac = self._new_mac(key)
+        for chunk in chunks:
+            mac.update(chunk)
+        return mac.digest()
 
-if has_crypto:
-
-    class RSAAlgorithm(Algorithm):
-        """
-        Performs signing and verification operations using
-        RSASSA-PKCS-v1_5 and the specified hash function.
-        """
-
-        SHA256: ClassVar[type[hashes.HashAlgorithm]] = hashes.SHA256
-        SHA384: ClassVar[type[hashes.HashAlgorithm]] = hashes.SHA384
-        SHA512: ClassVar[type[hashes.HashAlgorithm]] = hashes.SHA512
-
-        def __init__(self, hash_alg: type[hashes.HashAlgorithm]) -> None:
-            self.hash_alg = hash_alg
-
-        def prepare_key(self, key: AllowedRSAKeys | str | bytes) -> AllowedRSAKeys:
-            if isinstance(key, (RSAPrivateKey, RSAPublicKey)):
-                return key
-
-            if not isinstance(key, (bytes, str)):
-                raise TypeError("Expecting a PEM-formatted key.")
-
-            key_bytes = force_bytes(key)
-
-            try:
-                if key_bytes.startswith(b"ssh-rsa"):
-                    return cast(RSAPublicKey, load_ssh_public_key(key_bytes))
-                else:
-                    return cast(
-                        RSAPrivateKey, load_pem_private_key(key_bytes, password=None)
-                    )
-            except ValueError:
-                try:
-                    return cast(RSAPublicKey, load_pem_public_key(key_bytes))
-                except (ValueError, UnsupportedAlgorithm):
-                    raise InvalidKeyError(
-                        "Could not parse the provided public key."
-                    ) from None
-
-        @overload
-        @staticmethod
-        def to_jwk(
-            key_obj: AllowedRSAKeys, as_dict: Literal[True]
-        ) -> JWKDict: ...  # pragma: no cover
-
-        @overload
-        @staticmethod
-        def to_jwk(
-            key_obj: AllowedRSAKeys, as_dict: Literal[False] = False
-        ) -> str: ...  # pragma: no cover
-
-        @staticmethod
-        def to_jwk(key_obj: AllowedRSAKeys, as_dict: bool = False) -> JWKDict | str:
-            obj: dict[str, Any] | None = None
-
-            if hasattr(key_obj, "private_numbers"):
-                # Private key
-                numbers = key_obj.private_numbers()
-
-                obj = {
-                    "kty": "RSA",
-                    "key_ops": ["sign"],
-                    "n": to_base64url_uint(numbers.public_numbers.n).decode(),
-                    "e": to_base64url_uint(numbers.public_numbers.e).decode(),
-                    "d": to_base64url_uint(numbers.d).decode(),
-                    "p": to_base64url_uint(numbers.p).decode(),
-                    "q": to_base64url_uint(numbers.q).decode(),
-                    "dp": to_base64url_uint(numbers.dmp1).decode(),
-                    "dq": to_base64url_uint(numbers.dmq1).decode(),
-                    "qi": to_base64url_uint(numbers.iqmp).decode(),
-                }
-
-            elif hasattr(key_obj, "verify"):
-                # Public key
-                numbers = key_obj.public_numbers()
-
-                obj = {
-                    "kty": "RSA",
-                    "key_ops": ["verify"],
-                    "n": to_base64url_uint(numbers.n).decode(),
-                    "e": to_base64url_uint(numbers.e).decode(),
-                }
-            else:
-                raise InvalidKeyError("Not a public or private key")
-
-            if as_dict:
-                return obj
-            else:
-                return json.dumps(obj)
-
-        @staticmethod
-        def from_jwk(jwk: str | JWKDict) -> AllowedRSAKeys:
-            try:
-                if isinstance(jwk, str):
-                    obj = json.loads(jwk)
-                elif isinstance(jwk, dict):
-                    obj = jwk
-                else:
-                    raise ValueError
-            except ValueError:
-                raise InvalidKeyError("Key is not valid JSON") from None
-
-            if obj.get("kty") != "RSA":
-                raise InvalidKeyError("Not an RSA key") from None
-
-            if "d" in obj and "e" in obj and "n" in obj:
-                # Private key
-                if "oth" in obj:
-                    raise InvalidKeyError(
-                        "Unsupported RSA private key: > 2 primes not supported"
-                    )
-
-                other_props = ["p", "q", "dp", "dq", "qi"]
-                props_found = [prop in obj for prop in other_props]
-                any_props_found = any(props_found)
-
-                if any_props_found and not all(props_found):
-                    raise InvalidKeyError(
-                        "RSA key must include all parameters if any are present besides d"
-                    ) from None
-
-                public_numbers = RSAPublicNumbers(
-                    from_base64url_uint(obj["e"]),
-                    from_base64url_uint(obj["n"]),
-                )
-
-                if any_props_found:
-                    numbers = RSAPrivateNumbers(
-                        d=from_base64url_uint(obj["d"]),
-                        p=from_base64url_uint(obj["p"]),
-                        q=from_base64url_uint(obj["q"]),
-                        dmp1=from_base64url_uint(obj["dp"]),
-                        dmq1=from_base64url_uint(obj["dq"]),
-                        iqmp=from_base64url_uint(obj["qi"]),
-                        public_numbers=public_numbers,
-                    )
-                else:
-                    d = from_base64url_uint(obj["d"])
-                    p, q = rsa_recover_prime_factors(
-                        public_numbers.n, d, public_numbers.e
-                    )
-
-                    numbers = RSAPrivateNumbers(
-                        d=d,
-                        p=p,
-                        q=q,
-                        dmp1=rsa_crt_dmp1(d, p),
-                        dmq1=rsa_crt_dmq1(d, q),
-                        iqmp=rsa_crt_iqmp(p, q),
-                        public_numbers=public_numbers,
-                    )
-
-                return numbers.private_key()
-            elif "n" in obj and "e" in obj:
-                # Public key
-                return RSAPublicNumbers(
-                    from_base64url_uint(obj["e"]),
-                    from_base64url_uint(obj["n"]),
-                ).public_key()
-            else:
-                raise InvalidKeyError("Not a public or private key")
-
-        def sign(self, msg: bytes, key: RSAPrivateKey) -> bytes:
-            return key.sign(msg, padding.PKCS1v15(), self.hash_alg())
-
-        def verify(self, msg: bytes, key: RSAPublicKey, sig: bytes) -> bool:
-            try:
-                key.verify(sig, msg, padding.PKCS1v15(), self.hash_alg())
-                return True
-            except InvalidSignature:
-                return False
-
-    class ECAlgorithm(Algorithm):
-        """
-        Performs signing and verification operations using
-        ECDSA and the specified hash function
-        """
-
-        SHA256: ClassVar[type[hashes.HashAlgorithm]] = hashes.SHA256
-        SHA384: ClassVar[type[hashes.HashAlgorithm]] = hashes.SHA384
-        SHA512: ClassVar[type[hashes.HashAlgorithm]] = hashes.SHA512
-
-        def __init__(self, hash_alg: type[hashes.HashAlgorithm]) -> None:
-            self.hash_alg = hash_alg
-
-        def prepare_key(self, key: AllowedECKeys | str | bytes) -> AllowedECKeys:
-            if isinstance(key, (EllipticCurvePrivateKey, EllipticCurvePublicKey)):
-                return key
-
-            if not isinstance(key, (bytes, str)):
-                raise TypeError("Expecting a PEM-formatted key.")
-
-            key_bytes = force_bytes(key)
-
-            # Attempt to load key. We don't know if it's
-            # a Signing Key or a Verifying Key, so we try
-            # the Verifying Key first.
-            try:
-                if key_bytes.startswith(b"ecdsa-sha2-"):
-                    crypto_key = load_ssh_public_key(key_bytes)
-                else:
-                    crypto_key = load_pem_public_key(key_bytes)  # type: ignore[assignment]
-            except ValueError:
-                crypto_key = load_pem_private_key(key_bytes, password=None)  # type: ignore[assignment]
-
-            # Explicit check the key to prevent confusing errors from cryptography
-            if not isinstance(
-                crypto_key, (EllipticCurvePrivateKey, EllipticCurvePublicKey)
-            ):
-                raise InvalidKeyError(
-                    "Expecting a EllipticCurvePrivateKey/EllipticCurvePublicKey. Wrong key provided for ECDSA algorithms"
-                ) from None
-
-            return crypto_key
-
-        def sign(self, msg: bytes, key: EllipticCurvePrivateKey) -> bytes:
-            der_sig = key.sign(msg, ECDSA(self.hash_alg()))
-
-            return der_to_raw_signature(der_sig, key.curve)
-
-        def verify(self, msg: bytes, key: AllowedECKeys, sig: bytes) -> bool:
-            try:
-                der_sig = raw_to_der_signature(sig, key.curve)
-            except ValueError:
-                return False
-
-            try:
-                public_key = (
-                    key.public_key()
-                    if isinstance(key, EllipticCurvePrivateKey)
-                    else key
-                )
-                public_key.verify(der_sig, msg, ECDSA(self.hash_alg()))
-                return True
-            except InvalidSignature:
-                return False
-
-        @overload
-        @staticmethod
-        def to_jwk(
-            key_obj: AllowedECKeys, as_dict: Literal[True]
-        ) -> JWKDict: ...  # pragma: no cover
-
-        @overload
-        @staticmethod
-        def to_jwk(
-            key_obj: AllowedECKeys, as_dict: Literal[False] = False
-        ) -> str: ...  # pragma: no cover
-
-        @staticmethod
-        def to_jwk(key_obj: AllowedECKeys, as_dict: bool = False) -> JWKDict | str:
-            if isinstance(key_obj, EllipticCurvePrivateKey):
-                public_numbers = key_obj.public_key().public_numbers()
-            elif isinstance(key_obj, EllipticCurvePublicKey):
-                public_numbers = key_obj.public_numbers()
-            else:
-                raise InvalidKeyError("Not a public or private key")
-
-            if isinstance(key_obj.curve, SECP256R1):
-                crv = "P-256"
-            elif isinstance(key_obj.curve, SECP384R1):
-                crv = "P-384"
-            elif isinstance(key_obj.curve, SECP521R1):
-                crv = "P-521"
-            elif isinstance(key_obj.curve, SECP256K1):
-                crv = "secp256k1"
-            else:
-                raise InvalidKeyError(f"Invalid curve: {key_obj.curve}")
-
-            obj: dict[str, Any] = {
-                "kty": "EC",
-                "crv": crv,
-                "x": to_base64url_uint(
-                    public_numbers.x,
-                    bit_length=key_obj.curve.key_size,
-                ).decode(),
-                "y": to_base64url_uint(
-                    public_numbers.y,
-                    bit_length=key_obj.curve.key_size,
-                ).decode(),
-            }
-
-            if isinstance(key_obj, EllipticCurvePrivateKey):
-                obj["d"] = to_base64url_uint(
-                    key_obj.private_numbers().private_value,
-                    bit_length=key_obj.curve.key_size,
-                ).decode()
-
-            if as_dict:
-                return obj
-            else:
-                return json.dumps(obj)
-
-        @staticmethod
-        def from_jwk(jwk: str | JWKDict) -> AllowedECKeys:
-            try:
-                if isinstance(jwk, str):
-                    obj = json.loads(jwk)
-                elif isinstance(jwk, dict):
-                    obj = jwk
-                else:
-                    raise ValueError
-            except ValueError:
-                raise InvalidKeyError("Key is not valid JSON") from None
-
-            if obj.get("kty") != "EC":
-                raise InvalidKeyError("Not an Elliptic curve key") from None
-
-            if "x" not in obj or "y" not in obj:
-                raise InvalidKeyError("Not an Elliptic curve key") from None
-
-            x = base64url_decode(obj.get("x"))
-            y = base64url_decode(obj.get("y"))
-
-            curve = obj.get("crv")
-            curve_obj: EllipticCurve
-
-            if curve == "P-256":
-                if len(x) == len(y) == 32:
-                    curve_obj = SECP256R1()
-                else:
-                    raise InvalidKeyError(
-                        "Coords should be 32 bytes for curve P-256"
-                    ) from None
-            elif curve == "P-384":
-                if len(x) == len(y) == 48:
-                    curve_obj = SECP384R1()
-                else:
-                    raise InvalidKeyError(
-                        "Coords should be 48 bytes for curve P-384"
-                    ) from None
-            elif curve == "P-521":
-                if len(x) == len(y) == 66:
-                    curve_obj = SECP521R1()
-                else:
-                    raise InvalidKeyError(
-                        "Coords should be 66 bytes for curve P-521"
-                    ) from None
-            elif curve == "secp256k1":
-                if len(x) == len(y) == 32:
-                    curve_obj = SECP256K1()
-                else:
-                    raise InvalidKeyError(
-                        "Coords should be 32 bytes for curve secp256k1"
-                    )
-            else:
-                raise InvalidKeyError(f"Invalid curve: {curve}")
-
-            public_numbers = EllipticCurvePublicNumbers(
-                x=int.from_bytes(x, byteorder="big"),
-                y=int.from_bytes(y, byteorder="big"),
-                curve=curve_obj,
-            )
-
-            if "d" not in obj:
-                return public_numbers.public_key()
-
-            d = base64url_decode(obj.get("d"))
-            if len(d) != len(x):
-                raise InvalidKeyError(
-                    "D should be {} bytes for curve {}", len(x), curve
-                )
-
-            return EllipticCurvePrivateNumbers(
-                int.from_bytes(d, byteorder="big"), public_numbers
-            ).private_key()
-
-    class RSAPSSAlgorithm(RSAAlgorithm):
-        """
-        Performs a signature using RSASSA-PSS with MGF1
-        """
-
-        def sign(self, msg: bytes, key: RSAPrivateKey) -> bytes:
-            return key.sign(
-                msg,
-                padding.PSS(
-                    mgf=padding.MGF1(self.hash_alg()),
-                    salt_length=self.hash_alg().digest_size,
-                ),
-                self.hash_alg(),
-            )
-
-        def verify(self, msg: bytes, key: RSAPublicKey, sig: bytes) -> bool:
-            try:
-                key.verify(
-                    sig,
-                    msg,
-                    padding.PSS(
-                        mgf=padding.MGF1(self.hash_alg()),
-                        salt_length=self.hash_alg().digest_size,
-                    ),
-                    self.hash_alg(),
-                )
-                return True
-            except InvalidSignature:
-                return False
-
-    class OKPAlgorithm(Algorithm):
-        """
-        Performs signing and verification operations using EdDSA
-
-        This class requires ``cryptography>=2.6`` to be installed.
-        """
-
-        def __init__(self, **kwargs: Any) -> None:
-            pass
-
-        def prepare_key(self, key: AllowedOKPKeys | str | bytes) -> AllowedOKPKeys:
-            if isinstance(key, (bytes, str)):
-                key_str = key.decode("utf-8") if isinstance(key, bytes) else key
-                key_bytes = key.encode("utf-8") if isinstance(key, str) else key
-
-                if "-----BEGIN PUBLIC" in key_str:
-                    key = load_pem_public_key(key_bytes)  # type: ignore[assignment]
-                elif "-----BEGIN PRIVATE" in key_str:
-                    key = load_pem_private_key(key_bytes, password=None)  # type: ignore[assignment]
-                elif key_str[0:4] == "ssh-":
-                    key = load_ssh_public_key(key_bytes)  # type: ignore[assignment]
-
-            # Explicit check the key to prevent confusing errors from cryptography
-            if not isinstance(
-                key,
-                (Ed25519PrivateKey, Ed25519PublicKey, Ed448PrivateKey, Ed448PublicKey),
-            ):
-                raise InvalidKeyError(
-                    "Expecting a EllipticCurvePrivateKey/EllipticCurvePublicKey. Wrong key provided for EdDSA algorithms"
-                )
-
-            return key
-
-        def sign(
-            self, msg: str | bytes, key: Ed25519PrivateKey | Ed448PrivateKey
-        ) -> bytes:
-            """
-            Sign a message ``msg`` using the EdDSA private key ``key``
-            :param str|bytes msg: Message to sign
-            :param Ed25519PrivateKey}Ed448PrivateKey key: A :class:`.Ed25519PrivateKey`
-                or :class:`.Ed448PrivateKey` isinstance
-            :return bytes signature: The signature, as bytes
-            """
-            msg_bytes = msg.encode("utf-8") if isinstance(msg, str) else msg
-            return key.sign(msg_bytes)
-
-        def verify(
-            self, msg: str | bytes, key: AllowedOKPKeys, sig: str | bytes
-        ) -> bool:
-            """
-            Verify a given ``msg`` against a signature ``sig`` using the EdDSA key ``key``
-
-            :param str|bytes sig: EdDSA signature to check ``msg`` against
-            :param str|bytes msg: Message to sign
-            :param Ed25519PrivateKey|Ed25519PublicKey|Ed448PrivateKey|Ed448PublicKey key:
-                A private or public EdDSA key instance
-            :return bool verified: True if signature is valid, False if not.
-            """
-            try:
-                msg_bytes = msg.encode("utf-8") if isinstance(msg, str) else msg
-                sig_bytes = sig.encode("utf-8") if isinstance(sig, str) else sig
-
-                public_key = (
-                    key.public_key()
-                    if isinstance(key, (Ed25519PrivateKey, Ed448PrivateKey))
-                    else key
-                )
-                public_key.verify(sig_bytes, msg_bytes)
-                return True  # If no exception was raised, the signature is valid.
-            except InvalidSignature:
-                return False
-
-        @overload
-        @staticmethod
-        def to_jwk(
-            key: AllowedOKPKeys, as_dict: Literal[True]
-        ) -> JWKDict: ...  # pragma: no cover
-
-        @overload
-        @staticmethod
-        def to_jwk(
-            key: AllowedOKPKeys, as_dict: Literal[False] = False
-        ) -> str: ...  # pragma: no cover
-
-        @staticmethod
-        def to_jwk(key: AllowedOKPKeys, as_dict: bool = False) -> JWKDict | str:
-            if isinstance(key, (Ed25519PublicKey, Ed448PublicKey)):
-                x = key.public_bytes(
-                    encoding=Encoding.Raw,
-                    format=PublicFormat.Raw,
-                )
-                crv = "Ed25519" if isinstance(key, Ed25519PublicKey) else "Ed448"
-
-                obj = {
-                    "x": base64url_encode(force_bytes(x)).decode(),
-                    "kty": "OKP",
-                    "crv": crv,
-                }
-
-                if as_dict:
-                    return obj
-                else:
-                    return json.dumps(obj)
-
-            if isinstance(key, (Ed25519PrivateKey, Ed448PrivateKey)):
-                d = key.private_bytes(
-                    encoding=Encoding.Raw,
-                    format=PrivateFormat.Raw,
-                    encryption_algorithm=NoEncryption(),
-                )
-
-                x = key.public_key().public_bytes(
-                    encoding=Encoding.Raw,
-                    format=PublicFormat.Raw,
-                )
-
-                crv = "Ed25519" if isinstance(key, Ed25519PrivateKey) else "Ed448"
-                obj = {
-                    "x": base64url_encode(force_bytes(x)).decode(),
-                    "d": base64url_encode(force_bytes(d)).decode(),
-                    "kty": "OKP",
-                    "crv": crv,
-                }
-
-                if as_dict:
-                    return obj
-                else:
-                    return json.dumps(obj)
-
-            raise InvalidKeyError("Not a public or private key")
-
-        @staticmethod
-        def from_jwk(jwk: str | JWKDict) -> AllowedOKPKeys:
-            try:
-                if isinstance(jwk, str):
-                    obj = json.loads(jwk)
-                elif isinstance(jwk, dict):
-                    obj = jwk
-                else:
-                    raise ValueError
-            except ValueError:
-                raise InvalidKeyError("Key is not valid JSON") from None
-
-            if obj.get("kty") != "OKP":
-                raise InvalidKeyError("Not an Octet Key Pair")
-
-            curve = obj.get("crv")
-            if curve != "Ed25519" and curve != "Ed448":
-                raise InvalidKeyError(f"Invalid curve: {curve}")
-
-            if "x" not in obj:
-                raise InvalidKeyError('OKP should have "x" parameter')
-            x = base64url_decode(obj.get("x"))
-
-            try:
-                if "d" not in obj:
-                    if curve == "Ed25519":
-                        return Ed25519PublicKey.from_public_bytes(x)
-                    return Ed448PublicKey.from_public_bytes(x)
-                d = base64url_decode(obj.get("d"))
-                if curve == "Ed25519":
-                    return Ed25519PrivateKey.from_private_bytes(d)
-                return Ed448PrivateKey.from_private_bytes(d)
-            except ValueError as err:
-                raise InvalidKeyError("Invalid key parameter") from err
+    def verify_stream(
+        self, chunks: Iterable[PayloadChunk], key: bytes, sig: bytes
+    ) -> bool:
+        return hmac.compare_digest(sig, self.sign_stream(chunks, key))
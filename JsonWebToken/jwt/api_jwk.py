@@ -1,10 +1,11 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import time
 from typing import Any
 
-from .algorithms import get_default_algorithms, has_crypto, requires_cryptography
+from .algorithms import get_default_algorithm, has_crypto, requires_cryptography
 from .exceptions import (
     InvalidKeyError,
     MissingCryptographyError,
@@ -16,9 +17,24 @@ from .types import JWKDict
 
 
 class PyJWK:
-    def __init__(self, jwk_data: JWKDict, algorithm: str | None = None) -> None:
-        self._algorithms = get_default_algorithms()
-        self._jwk_data = jwk_data
+    __slots__ = (
+        "Algorithm",
+        "__weakref__",
+        "_jwk_data",
+        "_key_id",
+        "_key_type",
+        "_public_key_use",
+        "algorithm_name",
+        "key",
+    )
+
+    def __init__(
+        self,
+        jwk_data: JWKDict,
+        algorithm: str | None = None,
+        keep_jwk_data: bool = True,
+    ) -> None:
+        self._jwk_data: JWKDict | None = jwk_data
 
         kty = self._jwk_data.get("kty", None)
         if not kty:
@@ -62,16 +78,28 @@ class PyJWK:
 
         self.algorithm_name = algorithm
 
-        if algorithm in self._algorithms:
-            self.Algorithm = self._algorithms[algorithm]
-        else:
-            raise PyJWKError(f"Unable to find an algorithm for key: {self._jwk_data}")
+        try:
+            self.Algorithm = get_default_algorithm(algorithm)
+        except KeyError:
+            raise PyJWKError(
+                f"Unable to find an algorithm for key: {self._jwk_data}"
+            ) from None
 
         self.key = self.Algorithm.from_jwk(self._jwk_data)
 
+        self._key_type: str | None = kty
+        self._key_id: str | None = jwk_data.get("kid", None)
+        self._public_key_use: str | None = jwk_data.get("use", None)
+        if not keep_jwk_data:
+            # Everything the key needs has been taken from the JWK, so large
+            # key sets don't have to keep every raw JWK alive.
+            self._jwk_data = None
+
     @staticmethod
-    def from_dict(obj: JWKDict, algorithm: str | None = None) -> PyJWK:
-        return PyJWK(obj, algorithm)
+    def from_dict(
+        obj: JWKDict, algorithm: str | None = None, keep_jwk_data: bool = True
+    ) -> PyJWK:
+        return PyJWK(obj, algorithm, keep_jwk_data)
 
     @staticmethod
     def from_json(data: str, algorithm: None = None) -> PyJWK:
@@ -80,20 +108,45 @@ class PyJWK:
 
     @property
     def key_type(self) -> str | None:
-        return self._jwk_data.get("kty", None)
+        return self._key_type
 
     @property
     def key_id(self) -> str | None:
-        return self._jwk_data.get("kid", None)
+        return self._key_id
 
     @property
     def public_key_use(self) -> str | None:
-        return self._jwk_data.get("use", None)
+        return self._public_key_use
+
+    @property
+    def jwk_data(self) -> JWKDict | None:
+        """
+        The JWK the key was built from, or None if it was created with
+        ``keep_jwk_data=False``.
+        """
+        return self._jwk_data
 
 
 class PyJWKSet:
-    def __init__(self, keys: list[JWKDict]) -> None:
-        self.keys = []
+    __slots__ = (
+        "__weakref__",
+        "_keys_by_digest",
+        "_keys_by_kid",
+        "_signing_keys_by_kid",
+        "_unusable_digests",
+        "added_keys",
+        "keys",
+        "removed_keys",
+        "signing_keys",
+    )
+
+    def __init__(
+        self,
+        keys: list[JWKDict],
+        previous: PyJWKSet | None = None,
+        keep_jwk_data: bool = True,
+    ) -> None:
+        self.keys: list[PyJWK] = []
 
         if not keys:
             raise PyJWKSetError("The JWK Set did not contain any keys")
@@ -101,24 +154,80 @@ class PyJWKSet:
         if not isinstance(keys, list):
             raise PyJWKSetError("Invalid JWK Set value")
 
+        # Keys are indexed by a canonical form of their members, so the next set built
+        # with ``previous=self`` reuses the PyJWK of every unchanged key
+        # instead of parsing it again.
+        self._keys_by_digest: dict[bytes, PyJWK] = {}
+        self._unusable_digests: set[bytes] = set()
+        # The keys parsed for this set, and the keys of ``previous`` it no
+        # longer contains (a changed key is in both lists), so caches built
+        # on the previous keys can be invalidated.
+        self.added_keys: list[PyJWK] = []
+        self.removed_keys: list[PyJWK] = []
+
         for key in keys:
+            digest = _jwk_digest(key)
+            if digest is not None and previous is not None:
+                if digest in previous._unusable_digests:
+                    self._unusable_digests.add(digest)
+                    continue
+                jwk = previous._keys_by_digest.get(digest)
+                if jwk is not None:
+                    self.keys.append(jwk)
+                    self._keys_by_digest[digest] = jwk
+                    continue
+
             try:
-                self.keys.append(PyJWK(key))
+                jwk = PyJWK(key, keep_jwk_data=keep_jwk_data)
             except PyJWTError as error:
                 if isinstance(error, MissingCryptographyError):
                     raise error
                 # skip unusable keys
+                if digest is not None:
+                    self._unusable_digests.add(digest)
                 continue
+            self.keys.append(jwk)
+            self.added_keys.append(jwk)
+            if digest is not None:
+                self._keys_by_digest.setdefault(digest, jwk)
+
+        if previous is not None:
+            kept = {id(jwk) for jwk in self.keys}
+            self.removed_keys = [jwk for jwk in previous.keys if id(jwk) not in kept]
 
         if len(self.keys) == 0:
             raise PyJWKSetError(
                 "The JWK Set did not contain any usable keys. Perhaps 'cryptography' is not installed?"
             )
 
+        # kid -> key indexes, built once so lookups don't scan self.keys.
+        # The first key with a given kid wins, as with a linear scan.
+        self._keys_by_kid: dict[str, PyJWK] = {}
+        self._signing_keys_by_kid: dict[str, PyJWK] = {}
+        self.signing_keys: list[PyJWK] = []
+        for jwk in self.keys:
+            kid = jwk.key_id
+            if not isinstance(kid, str):
+                continue
+            self._keys_by_kid.setdefault(kid, jwk)
+            if kid and jwk.public_key_use in ("sig", None):
+                self.signing_keys.append(jwk)
+                self._signing_keys_by_kid.setdefault(kid, jwk)
+
     @staticmethod
-    def from_dict(obj: dict[str, Any]) -> PyJWKSet:
+    def from_dict(
+        obj: dict[str, Any],
+        previous: PyJWKSet | None = None,
+        keep_jwk_data: bool = True,
+    ) -> PyJWKSet:
+        """
+        Builds a key set from a JWKS document. With ``previous``, the keys
+        whose members are unchanged are reused from it rather than parsed
+        again; see :attr:`added_keys` and :attr:`removed_keys`. With
+        ``keep_jwk_data=False``, the keys don't keep their raw JWK.
+        """
         keys = obj.get("keys", [])
-        return PyJWKSet(keys)
+        return PyJWKSet(keys, previous, keep_jwk_data)
 
     @staticmethod
     def from_json(data: str) -> PyJWKSet:
@@ -126,18 +235,60 @@ class PyJWKSet:
         return PyJWKSet.from_dict(obj)
 
     def __getitem__(self, kid: str) -> PyJWK:
-        for key in self.keys:
-            if key.key_id == kid:
-                return key
-        raise KeyError(f"keyset has no key for kid: {kid}")
+        key = self._keys_by_kid.get(kid) if isinstance(kid, str) else None
+        if key is None:
+            raise KeyError(f"keyset has no key for kid: {kid}")
+        return key
+
+    def get_signing_key(self, kid: str) -> PyJWK | None:
+        """
+        Returns the signing key (``use`` of ``sig`` or unset) with the given
+        kid, or None.
+        """
+        if not isinstance(kid, str):
+            return None
+        return self._signing_keys_by_kid.get(kid)
+
+
+def _jwk_digest(jwk: Any) -> bytes | None:
+    """
+    Returns a SHA-256 digest of a canonical form of a JWK's members, or None
+    if it has none. A digest rather than the members themselves, so the
+    index doesn't keep the raw JWKs alive.
+    """
+    if not isinstance(jwk, dict):
+        return None
+    # The common case of string and list-of-string members is much cheaper
+    # to canonicalize as the repr of a sorted tuple than as JSON.
+    members = []
+    for name, value in jwk.items():
+        if name.__class__ is not str:
+            break
+        if value.__class__ is list and all(v.__class__ is str for v in value):
+            value = tuple(value)
+        elif value.__class__ is not str:
+            break
+        members.append((name, value))
+    else:
+        return hashlib.sha256(repr(tuple(sorted(members))).encode()).digest()
+
+    try:
+        canonical = "json:" + json.dumps(jwk, sort_keys=True, separators=(",", ":"))
+    except (TypeError, ValueError):
+        return None
+    return hashlib.sha256(canonical.encode()).digest()
 
 
 class PyJWTSetWithTimestamp:
-    def __init__(self, jwk_set: PyJWKSet):
+    __slots__ = ("jwk_set", "timestamp")
+
+    # jwk_set is the raw JWKS document, see JWKSetCache.
+
+    def __init__(self, jwk_set: dict[str, Any]):
         self.jwk_set = jwk_set
         self.timestamp = time.monotonic()
 
-    def get_jwk_set(self) -> PyJWKSet:
+    def get_jwk_set(self) -> dict[str, Any]:
         return self.jwk_set
 
     def get_timestamp(self) -> float:
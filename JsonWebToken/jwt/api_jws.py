@@ -3,8 +3,9 @@ from __future__ import annotations
 import binascii
 import json
 import warnings
-from collections.abc import Sequence
-from typing import TYPE_CHECKING, Any
+from collections.abc import Iterable, Iterator, Sequence
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, BinaryIO
 
 from .algorithms import (
     Algorithm,
@@ -18,21 +19,36 @@ from .exceptions import (
     InvalidAlgorithmError,
     InvalidSignatureError,
     InvalidTokenError,
+    PyJWTError,
 )
+from .json_codecs import JSONCodec, get_default_json_codec
+from .types import PayloadChunk
 from .utils import base64url_decode, base64url_encode
 from .warnings import RemovedInPyjwt3Warning
 
 if TYPE_CHECKING:
     from .algorithms import AllowedPrivateKeys, AllowedPublicKeys
+    from .instrumentation import MetricCallback
+
+# Bytes read at a time from file objects passed to the streaming methods.
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# Header value types whose encoded header segment encode() may cache.
+_HEADER_CACHE_TYPES = frozenset({str, int, bool, type(None)})
 
 
 class PyJWS:
     header_typ = "JWT"
+    # Upper bound on the number of encoded header segments and prepared
+    # signing keys that encode() remembers.
+    max_cached_headers = 256
 
     def __init__(
         self,
         algorithms: Sequence[str] | None = None,
         options: dict[str, Any] | None = None,
+        json_codec: JSONCodec | None = None,
+        on_metric: MetricCallback | None = None,
     ) -> None:
         self._algorithms = get_default_algorithms()
         self._valid_algs = (
@@ -47,6 +63,14 @@ class PyJWS:
         if options is None:
             options = {}
         self.options = {**self._get_default_options(), **options}
+        # Serializes the header; orjson or msgspec when installed.
+        self.json_codec = (
+            json_codec if json_codec is not None else get_default_json_codec()
+        )
+        self._header_segments: dict[tuple[Any, ...], bytes] = {}
+        self._signing_keys: dict[tuple[Any, ...], Any] = {}
+        # Receives stage timings and counters, see jwt.instrumentation.
+        self.on_metric = on_metric
 
     @staticmethod
     def _get_default_options() -> dict[str, bool]:
@@ -113,47 +137,37 @@ class PyJWS:
         sort_headers: bool = True,
     ) -> str:
         segments = []
+        on_metric = self.on_metric
+        if on_metric is not None:
+            start = perf_counter()
 
-        # declare a new var to narrow the type for type checkers
-        if algorithm is None:
-            if isinstance(key, PyJWK):
-                algorithm_ = key.algorithm_name
-            else:
-                algorithm_ = "HS256"
-        else:
-            algorithm_ = algorithm
-
-        # Prefer headers values if present to function parameters.
-        if headers:
-            headers_alg = headers.get("alg")
-            if headers_alg:
-                algorithm_ = headers["alg"]
-
-            headers_b64 = headers.get("b64")
-            if headers_b64 is False:
-                is_payload_detached = True
+        algorithm_ = self._get_encode_algorithm(key, algorithm, headers)
+        if headers and headers.get("b64") is False:
+            is_payload_detached = True
 
         # Header
-        header: dict[str, Any] = {"typ": self.header_typ, "alg": algorithm_}
-
-        if headers:
-            self._validate_headers(headers)
-            header.update(headers)
-
-        if not header["typ"]:
-            del header["typ"]
-
-        if is_payload_detached:
-            header["b64"] = False
-        elif "b64" in header:
-            # True is the standard value for b64, so no need for it
-            del header["b64"]
-
-        json_header = json.dumps(
-            header, separators=(",", ":"), cls=json_encoder, sort_keys=sort_headers
-        ).encode()
+        header_key = None
+        if json_encoder is None:
+            header_key = self._header_cache_key(
+                algorithm_, headers, is_payload_detached, sort_headers
+            )
+        header_segment = (
+            self._header_segments.get(header_key) if header_key is not None else None
+        )
+        if header_segment is None:
+            header_segment = self._encode_header(
+                algorithm_, headers, json_encoder, is_payload_detached, sort_headers
+            )
+            if header_key is not None:
+                if len(self._header_segments) >= self.max_cached_headers:
+                    self._header_segments.clear()
+                self._header_segments[header_key] = header_segment
 
-        segments.append(base64url_encode(json_header))
+        segments.append(header_segment)
+        if on_metric is not None:
+            now = perf_counter()
+            on_metric("jws.encode.header_seconds", now - start, {})
+            start = now
 
         if is_payload_detached:
             msg_payload = payload
@@ -163,14 +177,27 @@ class PyJWS:
 
         # Segments
         signing_input = b".".join(segments)
+        if on_metric is not None:
+            now = perf_counter()
+            on_metric("jws.encode.payload_seconds", now - start, {})
+            start = now
 
         alg_obj = self.get_algorithm_by_name(algorithm_)
         if isinstance(key, PyJWK):
             key = key.key
-        key = alg_obj.prepare_key(key)
+        key = self._prepare_signing_key(alg_obj, key)
+        if on_metric is not None:
+            now = perf_counter()
+            on_metric("jws.encode.prepare_key_seconds", now - start, {})
+            start = now
+
         signature = alg_obj.sign(signing_input, key)
 
         segments.append(base64url_encode(signature))
+        if on_metric is not None:
+            on_metric(
+                "jws.encode.sign_seconds", perf_counter() - start, {"alg": algorithm_}
+            )
 
         # Don't put the payload content inside the encoded token when detached
         if is_payload_detached:
@@ -179,6 +206,148 @@ class PyJWS:
 
         return encoded_string.decode("utf-8")
 
+    def encode_detached_stream(
+        self,
+        payload: Iterable[PayloadChunk] | BinaryIO,
+        key: AllowedPrivateKeys | PyJWK | str | bytes,
+        algorithm: str | None = None,
+        headers: dict[str, Any] | None = None,
+        json_encoder: type[json.JSONEncoder] | None = None,
+        sort_headers: bool = True,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> str:
+        """
+        Signs a detached, unencoded payload (RFC 7797) read from a binary file
+        object or an iterable of bytes chunks, without holding it in memory.
+
+        The returned token has an empty payload segment and the ``b64: false``
+        and ``crit: ["b64"]`` headers, so it verifies with
+        :meth:`decode_complete` given ``detached_payload``, as well as with
+        :meth:`decode_detached_stream`. EdDSA needs the whole message at once
+        and is not supported.
+        """
+        algorithm_ = self._get_encode_algorithm(key, algorithm, headers)
+
+        headers = dict(headers) if headers else {}
+        crit = list(headers.get("crit") or [])
+        if "b64" not in crit:
+            crit.append("b64")
+        headers["crit"] = crit
+        header_segment = self._encode_header(
+            algorithm_, headers, json_encoder, True, sort_headers
+        )
+
+        alg_obj = self.get_algorithm_by_name(algorithm_)
+        if isinstance(key, PyJWK):
+            key = key.key
+        key = self._prepare_signing_key(alg_obj, key)
+        try:
+            signature = alg_obj.sign_stream(
+                _iter_signing_input(header_segment, payload, chunk_size), key
+            )
+        except NotImplementedError as e:
+            raise NotImplementedError(
+                "Algorithm does not support streamed payloads"
+            ) from e
+
+        token = b".".join([header_segment, b"", base64url_encode(signature)])
+        return token.decode("utf-8")
+
+    def _get_encode_algorithm(
+        self,
+        key: AllowedPrivateKeys | PyJWK | str | bytes,
+        algorithm: str | None,
+        headers: dict[str, Any] | None,
+    ) -> str:
+        # Prefer headers values if present to function parameters.
+        if headers:
+            headers_alg = headers.get("alg")
+            if headers_alg:
+                return headers_alg
+
+        if algorithm is not None:
+            return algorithm
+        if isinstance(key, PyJWK):
+            return key.algorithm_name
+        return "HS256"
+
+    def _header_cache_key(
+        self,
+        algorithm: str,
+        headers: dict[str, Any] | None,
+        is_payload_detached: bool,
+        sort_headers: bool,
+    ) -> tuple[Any, ...] | None:
+        """
+        Returns the key under which the encoded header segment is cached, or
+        None if the headers can't be cached: only str keys with str, int,
+        bool or None values are, by exact type. Floats aren't, since 0.0 and
+        -0.0 would share a key but serialize differently.
+        """
+        items: tuple[Any, ...] = ()
+        if headers:
+            # The value types are part of the key, since 1 and True are
+            # equal but serialize differently.
+            items = tuple((k, v.__class__, v) for k, v in headers.items())
+            for k, value_type, _ in items:
+                if k.__class__ is not str or value_type not in _HEADER_CACHE_TYPES:
+                    return None
+        return (
+            self.json_codec,
+            self.header_typ,
+            algorithm,
+            is_payload_detached,
+            sort_headers,
+            items,
+        )
+
+    def _encode_header(
+        self,
+        algorithm: str,
+        headers: dict[str, Any] | None,
+        json_encoder: type[json.JSONEncoder] | None,
+        is_payload_detached: bool,
+        sort_headers: bool,
+    ) -> bytes:
+        header: dict[str, Any] = {"typ": self.header_typ, "alg": algorithm}
+
+        if headers:
+            self._validate_headers(headers)
+            header.update(headers)
+
+        if not header["typ"]:
+            del header["typ"]
+
+        if is_payload_detached:
+            header["b64"] = False
+        elif "b64" in header:
+            # True is the standard value for b64, so no need for it
+            del header["b64"]
+
+        if json_encoder is None:
+            json_header = self.json_codec.dumps(header, sort_keys=sort_headers)
+        else:
+            json_header = json.dumps(
+                header, separators=(",", ":"), cls=json_encoder, sort_keys=sort_headers
+            ).encode()
+
+        return base64url_encode(json_header)
+
+    def _prepare_signing_key(self, alg_obj: Algorithm, key: Any) -> Any:
+        if not isinstance(key, (str, bytes)):
+            return alg_obj.prepare_key(key)
+
+        # Preparing a secret (e.g. an HMAC key, which is checked for PEM and
+        # SSH formats) costs more than signing a short message, so reuse it.
+        cache_key = (alg_obj, key)
+        prepared_key = self._signing_keys.get(cache_key)
+        if prepared_key is None:
+            prepared_key = alg_obj.prepare_key(key)
+            if len(self._signing_keys) >= self.max_cached_headers:
+                self._signing_keys.clear()
+            self._signing_keys[cache_key] = prepared_key
+        return prepared_key
+
     def decode_complete(
         self,
         jwt: str | bytes,
@@ -206,7 +375,89 @@ class PyJWS:
                 'It is required that you pass in a value for the "algorithms" argument when calling decode().'
             )
 
+        return self._decode_loaded(
+            jwt, key, algorithms, verify_signature, detached_payload
+        )
+
+    def decode_complete_many(
+        self,
+        jwts: Iterable[str | bytes],
+        key: AllowedPublicKeys | PyJWK | str | bytes = "",
+        algorithms: Sequence[str] | None = None,
+        options: dict[str, Any] | None = None,
+        detached_payload: bytes | None = None,
+    ) -> list[dict[str, Any] | PyJWTError]:
+        """
+        Decodes a batch of tokens sharing the same key, algorithms and options.
+
+        Options are merged and the key is prepared once per algorithm for the
+        whole batch. The result has one entry per token, in input order: the
+        decoded dict, or the :class:`PyJWTError` raised for that token, so one
+        bad token does not abort the batch.
+        """
+        if options is None:
+            options = {}
+        merged_options = {**self.options, **options}
+        verify_signature = merged_options["verify_signature"]
+
+        if verify_signature and not algorithms and not isinstance(key, PyJWK):
+            raise DecodeError(
+                'It is required that you pass in a value for the "algorithms" argument when calling decode().'
+            )
+
+        prepared_keys: dict[str, tuple[Algorithm, Any]] = {}
+        results: list[dict[str, Any] | PyJWTError] = []
+        for jwt in jwts:
+            try:
+                decoded = self._decode_loaded(
+                    jwt,
+                    key,
+                    algorithms,
+                    verify_signature,
+                    detached_payload,
+                    prepared_keys=prepared_keys,
+                )
+            except PyJWTError as e:
+                results.append(e)
+            else:
+                results.append(decoded)
+
+        return results
+
+    def decode_many(
+        self,
+        jwts: Iterable[str | bytes],
+        key: AllowedPublicKeys | PyJWK | str | bytes = "",
+        algorithms: Sequence[str] | None = None,
+        options: dict[str, Any] | None = None,
+        detached_payload: bytes | None = None,
+    ) -> list[Any]:
+        """
+        Like :meth:`decode_complete_many`, but returns only the payload of
+        each successfully decoded token.
+        """
+        return [
+            decoded if isinstance(decoded, PyJWTError) else decoded["payload"]
+            for decoded in self.decode_complete_many(
+                jwts, key, algorithms, options, detached_payload=detached_payload
+            )
+        ]
+
+    def _decode_loaded(
+        self,
+        jwt: str | bytes,
+        key: AllowedPublicKeys | PyJWK | str | bytes,
+        algorithms: Sequence[str] | None,
+        verify_signature: bool,
+        detached_payload: bytes | None,
+        prepared_keys: dict[str, tuple[Algorithm, Any]] | None = None,
+    ) -> dict[str, Any]:
+        on_metric = self.on_metric
+        if on_metric is not None:
+            start = perf_counter()
         payload, signing_input, header, signature = self._load(jwt)
+        if on_metric is not None:
+            on_metric("jws.decode.load_seconds", perf_counter() - start, {})
 
         if header.get("b64", True) is False:
             if detached_payload is None:
@@ -217,7 +468,14 @@ class PyJWS:
             signing_input = b".".join([signing_input.rsplit(b".", 1)[0], payload])
 
         if verify_signature:
-            self._verify_signature(signing_input, header, signature, key, algorithms)
+            self._verify_signature(
+                signing_input,
+                header,
+                signature,
+                key,
+                algorithms,
+                prepared_keys=prepared_keys,
+            )
 
         return {
             "payload": payload,
@@ -225,6 +483,63 @@ class PyJWS:
             "signature": signature,
         }
 
+    def decode_detached_stream(
+        self,
+        jwt: str | bytes,
+        payload: Iterable[PayloadChunk] | BinaryIO,
+        key: AllowedPublicKeys | PyJWK | str | bytes = "",
+        algorithms: Sequence[str] | None = None,
+        options: dict[str, Any] | None = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> dict[str, Any]:
+        """
+        Verifies a token with a detached, unencoded payload (RFC 7797), read
+        from a binary file object or an iterable of bytes chunks, without
+        holding it in memory.
+
+        Returns the decoded header and signature. The payload is not read when
+        signature verification is disabled.
+        """
+        if options is None:
+            options = {}
+        merged_options = {**self.options, **options}
+        verify_signature = merged_options["verify_signature"]
+
+        if verify_signature and not algorithms and not isinstance(key, PyJWK):
+            raise DecodeError(
+                'It is required that you pass in a value for the "algorithms" argument when calling decode().'
+            )
+
+        _, signing_input, header, signature = self._load(jwt)
+
+        if header.get("b64", True) is not False:
+            raise DecodeError(
+                "A streamed payload requires a token with the b64 header set to false."
+            )
+        header_segment, _, payload_segment = signing_input.partition(b".")
+        if payload_segment:
+            raise DecodeError("The token must have a detached (empty) payload.")
+
+        if verify_signature:
+            alg_obj, prepared_key = self._get_verification_key(header, key, algorithms)
+            try:
+                verified = alg_obj.verify_stream(
+                    _iter_signing_input(header_segment, payload, chunk_size),
+                    prepared_key,
+                    signature,
+                )
+            except NotImplementedError as e:
+                raise InvalidAlgorithmError(
+                    "Algorithm does not support streamed payloads"
+                ) from e
+            if not verified:
+                raise InvalidSignatureError("Signature verification failed")
+
+        return {
+            "header": header,
+            "signature": signature,
+        }
+
     def decode(
         self,
         jwt: str | bytes,
@@ -265,11 +580,10 @@ class PyJWS:
         if not isinstance(jwt, bytes):
             raise DecodeError(f"Invalid token type. Token must be a {bytes}")
 
-        try:
-            signing_input, crypto_segment = jwt.rsplit(b".", 1)
-            header_segment, payload_segment = signing_input.split(b".", 1)
-        except ValueError as err:
-            raise DecodeError("Not enough segments") from err
+        signing_input, sep, crypto_segment = jwt.rpartition(b".")
+        header_segment, sep2, payload_segment = signing_input.partition(b".")
+        if not sep or not sep2:
+            raise DecodeError("Not enough segments")
 
         try:
             header_data = base64url_decode(header_segment)
@@ -277,7 +591,7 @@ class PyJWS:
             raise DecodeError("Invalid header padding") from err
 
         try:
-            header = json.loads(header_data)
+            header = self.json_codec.loads(header_data)
         except ValueError as e:
             raise DecodeError(f"Invalid header string: {e}") from e
 
@@ -303,7 +617,38 @@ class PyJWS:
         signature: bytes,
         key: AllowedPublicKeys | PyJWK | str | bytes = "",
         algorithms: Sequence[str] | None = None,
+        prepared_keys: dict[str, tuple[Algorithm, Any]] | None = None,
     ) -> None:
+        on_metric = self.on_metric
+        if on_metric is None:
+            alg_obj, prepared_key = self._get_verification_key(
+                header, key, algorithms, prepared_keys
+            )
+            if not alg_obj.verify(signing_input, prepared_key, signature):
+                raise InvalidSignatureError("Signature verification failed")
+            return
+
+        start = perf_counter()
+        alg_obj, prepared_key = self._get_verification_key(
+            header, key, algorithms, prepared_keys
+        )
+        now = perf_counter()
+        on_metric("jws.decode.prepare_key_seconds", now - start, {})
+
+        tags = {"alg": header["alg"]}
+        verified = alg_obj.verify(signing_input, prepared_key, signature)
+        on_metric("jws.decode.verify_seconds", perf_counter() - now, tags)
+        if not verified:
+            on_metric("jws.signature_failures", 1, tags)
+            raise InvalidSignatureError("Signature verification failed")
+
+    def _get_verification_key(
+        self,
+        header: dict[str, Any],
+        key: AllowedPublicKeys | PyJWK | str | bytes = "",
+        algorithms: Sequence[str] | None = None,
+        prepared_keys: dict[str, tuple[Algorithm, Any]] | None = None,
+    ) -> tuple[Algorithm, Any]:
         if algorithms is None and isinstance(key, PyJWK):
             algorithms = [key.algorithm_name]
         try:
@@ -317,15 +662,18 @@ class PyJWS:
         if isinstance(key, PyJWK):
             alg_obj = key.Algorithm
             prepared_key = key.key
+        elif prepared_keys is not None and alg in prepared_keys:
+            alg_obj, prepared_key = prepared_keys[alg]
         else:
             try:
                 alg_obj = self.get_algorithm_by_name(alg)
             except NotImplementedError as e:
                 raise InvalidAlgorithmError("Algorithm not supported") from e
             prepared_key = alg_obj.prepare_key(key)
+            if prepared_keys is not None:
+                prepared_keys[alg] = (alg_obj, prepared_key)
 
-        if not alg_obj.verify(signing_input, prepared_key, signature):
-            raise InvalidSignatureError("Signature verification failed")
+        return alg_obj, prepared_key
 
     def _validate_headers(self, headers: dict[str, Any]) -> None:
         if "kid" in headers:
@@ -336,10 +684,38 @@ class PyJWS:
             raise InvalidTokenError("Key ID header parameter must be a string")
 
 
+def _iter_signing_input(
+    header_segment: bytes, payload: Iterable[PayloadChunk] | BinaryIO, chunk_size: int
+) -> Iterator[PayloadChunk]:
+    yield header_segment
+    yield b"."
+    if hasattr(payload, "read"):
+        read = payload.read
+        chunk = read(chunk_size)
+        while chunk:
+            yield _check_chunk(chunk)
+            chunk = read(chunk_size)
+    else:
+        for chunk in payload:
+            yield _check_chunk(chunk)
+
+
+def _check_chunk(chunk: Any) -> PayloadChunk:
+    if not isinstance(chunk, (bytes, bytearray, memoryview)):
+        raise TypeError(
+            f"Payload chunks must be bytes-like, not {type(chunk).__name__}"
+        )
+    return chunk
+
+
 _jws_global_obj = PyJWS()
 encode = _jws_global_obj.encode
 decode_complete = _jws_global_obj.decode_complete
 decode = _jws_global_obj.decode
+decode_complete_many = _jws_global_obj.decode_complete_many
+decode_many = _jws_global_obj.decode_many
+encode_detached_stream = _jws_global_obj.encode_detached_stream
+decode_detached_stream = _jws_global_obj.decode_detached_stream
 register_algorithm = _jws_global_obj.register_algorithm
 unregister_algorithm = _jws_global_obj.unregister_algorithm
 get_algorithm_by_name = _jws_global_obj.get_algorithm_by_name
@@ -1,13 +1,17 @@
 from __future__ import annotations
 
 import json
+import math
+import os
 import warnings
 from calendar import timegm
 from collections.abc import Iterable, Sequence
 from datetime import datetime, timedelta, timezone
+from time import perf_counter
 from typing import TYPE_CHECKING, Any
 
 from . import api_jws
+from .api_jwk import PyJWK
 from .exceptions import (
     DecodeError,
     ExpiredSignatureError,
@@ -18,19 +22,58 @@ from .exceptions import (
     InvalidJTIError,
     InvalidSubjectError,
     MissingRequiredClaimError,
+    PyJWTError,
+    RevokedTokenError,
 )
+from .json_codecs import JSONCodec, get_default_json_codec
 from .warnings import RemovedInPyjwt3Warning
 
 if TYPE_CHECKING:
     from .algorithms import AllowedPrivateKeys, AllowedPublicKeys
-    from .api_jwk import PyJWK
+    from .instrumentation import MetricCallback
+    from .revocation import RevocationStore
+    from .token_cache import VerifiedTokenCache
 
 
 class PyJWT:
-    def __init__(self, options: dict[str, Any] | None = None) -> None:
+    def __init__(
+        self,
+        options: dict[str, Any] | None = None,
+        token_cache: VerifiedTokenCache | None = None,
+        json_codec: JSONCodec | None = None,
+        on_metric: MetricCallback | None = None,
+        revocation_store: RevocationStore | None = None,
+    ) -> None:
         if options is None:
             options = {}
         self.options: dict[str, Any] = {**self._get_default_options(), **options}
+        # Opt-in cache of verified tokens, consulted by decode_complete().
+        self.token_cache = token_cache
+        # Serializes the payload; orjson or msgspec when installed.
+        self.json_codec = (
+            json_codec if json_codec is not None else get_default_json_codec()
+        )
+        # Signs and verifies the tokens, and serializes their header, with
+        # the same JSON codec and metric callback.
+        self._jws = api_jws.PyJWS(json_codec=self.json_codec, on_metric=on_metric)
+        # Algorithms registered with jwt.register_algorithm() apply to every
+        # PyJWT, as when they all used the module-level PyJWS.
+        self._jws._algorithms = api_jws._jws_global_obj._algorithms
+        self._jws._valid_algs = api_jws._jws_global_obj._valid_algs
+        # Receives stage timings and counters, see jwt.instrumentation.
+        self.on_metric = on_metric
+        # Tokens whose jti it reports as revoked are rejected after the
+        # claims are validated, see jwt.revocation.
+        self.revocation_store = revocation_store
+
+    @property
+    def on_metric(self) -> MetricCallback | None:
+        return self._on_metric
+
+    @on_metric.setter
+    def on_metric(self, on_metric: MetricCallback | None) -> None:
+        self._on_metric = on_metric
+        self._jws.on_metric = on_metric
 
     @staticmethod
     def _get_default_options() -> dict[str, bool | list[str]]:
@@ -69,13 +112,18 @@ class PyJWT:
             if isinstance(payload.get(time_claim), datetime):
                 payload[time_claim] = timegm(payload[time_claim].utctimetuple())
 
+        on_metric = self.on_metric
+        if on_metric is not None:
+            start = perf_counter()
         json_payload = self._encode_payload(
             payload,
             headers=headers,
             json_encoder=json_encoder,
         )
+        if on_metric is not None:
+            on_metric("jwt.encode.payload_json_seconds", perf_counter() - start, {})
 
-        return api_jws.encode(
+        return self._jws.encode(
             json_payload,
             key,
             algorithm,
@@ -84,6 +132,69 @@ class PyJWT:
             sort_headers=sort_headers,
         )
 
+    def encode_many(
+        self,
+        payloads: Iterable[dict[str, Any]],
+        key: AllowedPrivateKeys | PyJWK | str | bytes,
+        algorithm: str | None = None,
+        headers: dict[str, Any] | None = None,
+        json_encoder: type[json.JSONEncoder] | None = None,
+        sort_headers: bool = True,
+        workers: int | None = None,
+    ) -> list[str]:
+        """
+        Encodes a batch of payloads with the same key, spreading the signing
+        over a pool of ``workers`` processes (default: one per CPU).
+
+        The key is sent to each worker once, when the worker starts. Workers
+        encode with a new instance of this class sharing only its JSON codec,
+        so its ``on_metric`` callback isn't called for them. Tokens are
+        returned in the order of ``payloads``. With ``workers=1`` the batch
+        is encoded in the calling process.
+        """
+        payloads = list(payloads)
+        if workers is None:
+            workers = os.cpu_count() or 1
+        workers = min(workers, len(payloads))
+
+        if workers <= 1:
+            return [
+                self.encode(
+                    payload,
+                    key,
+                    algorithm,
+                    headers,
+                    json_encoder,
+                    sort_headers=sort_headers,
+                )
+                for payload in payloads
+            ]
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        if isinstance(key, PyJWK):
+            if algorithm is None:
+                algorithm = key.algorithm_name
+            key = key.key
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_encode_worker,
+            # Only what encode() needs is sent: the token cache, revocation
+            # store or on_metric callback may not be picklable.
+            initargs=(
+                type(self),
+                self.json_codec,
+                _to_picklable_key(key),
+                algorithm,
+                headers,
+                json_encoder,
+                sort_headers,
+            ),
+        ) as executor:
+            chunksize = max(1, math.ceil(len(payloads) / (workers * 4)))
+            return list(executor.map(_encode_in_worker, payloads, chunksize=chunksize))
+
     def _encode_payload(
         self,
         payload: dict[str, Any],
@@ -96,6 +207,8 @@ class PyJWT:
         This method is intended to be overridden by subclasses that need to
         encode the payload in a different way, e.g. compress the payload.
         """
+        if json_encoder is None:
+            return self.json_codec.dumps(payload)
         return json.dumps(
             payload,
             separators=(",", ":"),
@@ -129,8 +242,7 @@ class PyJWT:
                 RemovedInPyjwt3Warning,
                 stacklevel=2,
             )
-        options = dict(options or {})  # shallow-copy or initialize an empty dict
-        options.setdefault("verify_signature", True)
+        options = self._normalize_options(options)
 
         # If the user has set the legacy `verify` argument, and it doesn't match
         # what the relevant `options` entry for the argument is, inform the user
@@ -144,16 +256,35 @@ class PyJWT:
                 stacklevel=2,
             )
 
-        if not options["verify_signature"]:
-            options.setdefault("verify_exp", False)
-            options.setdefault("verify_nbf", False)
-            options.setdefault("verify_iat", False)
-            options.setdefault("verify_aud", False)
-            options.setdefault("verify_iss", False)
-            options.setdefault("verify_sub", False)
-            options.setdefault("verify_jti", False)
+        merged_options = {**self.options, **options}
 
-        decoded = api_jws.decode_complete(
+        token_cache = self.token_cache
+        cache_key = None
+        if (
+            token_cache is not None
+            and merged_options["verify_signature"]
+            and detached_payload is None
+            and isinstance(jwt, (str, bytes))
+        ):
+            cache_key = token_cache.make_key(
+                jwt,
+                key,
+                (algorithms, merged_options, audience, issuer, subject, leeway),
+            )
+            cached = token_cache.get(cache_key, key)
+            if self.on_metric is not None:
+                self.on_metric(
+                    "jwt.token_cache_hits" if cached else "jwt.token_cache_misses",
+                    1,
+                    {},
+                )
+            if cached is not None:
+                if self.revocation_store is not None:
+                    # revoked after it was cached
+                    self._validate_revocation(cached["payload"])
+                return cached
+
+        decoded = self._jws.decode_complete(
             jwt,
             key=key,
             algorithms=algorithms,
@@ -161,9 +292,15 @@ class PyJWT:
             detached_payload=detached_payload,
         )
 
+        on_metric = self.on_metric
+        if on_metric is not None:
+            start = perf_counter()
         payload = self._decode_payload(decoded)
+        if on_metric is not None:
+            now = perf_counter()
+            on_metric("jwt.decode.payload_json_seconds", now - start, {})
+            start = now
 
-        merged_options = {**self.options, **options}
         self._validate_claims(
             payload,
             merged_options,
@@ -172,10 +309,114 @@ class PyJWT:
             leeway=leeway,
             subject=subject,
         )
+        if on_metric is not None:
+            on_metric("jwt.decode.claims_seconds", perf_counter() - start, {})
 
         decoded["payload"] = payload
+        if cache_key is not None:
+            token_cache.put(cache_key, key, decoded)  # type: ignore[union-attr]
         return decoded
 
+    def decode_complete_many(
+        self,
+        jwts: Iterable[str | bytes],
+        key: AllowedPublicKeys | PyJWK | str | bytes = "",
+        algorithms: Sequence[str] | None = None,
+        options: dict[str, Any] | None = None,
+        detached_payload: bytes | None = None,
+        audience: str | Iterable[str] | None = None,
+        issuer: str | Sequence[str] | None = None,
+        subject: str | None = None,
+        leeway: float | timedelta = 0,
+    ) -> list[dict[str, Any] | PyJWTError]:
+        """
+        Decodes and validates a batch of tokens sharing the same verification
+        configuration.
+
+        Options, leeway and the prepared key are computed once for the whole
+        batch. The result has one entry per token, in input order: the decoded
+        dict, or the :class:`PyJWTError` raised for that token.
+        """
+        options = self._normalize_options(options)
+        merged_options = {**self.options, **options}
+        if isinstance(leeway, timedelta):
+            leeway = leeway.total_seconds()
+
+        results = self._jws.decode_complete_many(
+            jwts,
+            key=key,
+            algorithms=algorithms,
+            options=options,
+            detached_payload=detached_payload,
+        )
+
+        for i, decoded in enumerate(results):
+            if isinstance(decoded, PyJWTError):
+                continue
+            try:
+                payload = self._decode_payload(decoded)
+                self._validate_claims(
+                    payload,
+                    merged_options,
+                    audience=audience,
+                    issuer=issuer,
+                    leeway=leeway,
+                    subject=subject,
+                )
+            except PyJWTError as e:
+                results[i] = e
+            else:
+                decoded["payload"] = payload
+
+        return results
+
+    def decode_many(
+        self,
+        jwts: Iterable[str | bytes],
+        key: AllowedPublicKeys | PyJWK | str | bytes = "",
+        algorithms: Sequence[str] | None = None,
+        options: dict[str, Any] | None = None,
+        detached_payload: bytes | None = None,
+        audience: str | Iterable[str] | None = None,
+        issuer: str | Sequence[str] | None = None,
+        subject: str | None = None,
+        leeway: float | timedelta = 0,
+    ) -> list[Any]:
+        """
+        Like :meth:`decode_complete_many`, but returns only the payload of
+        each successfully decoded token.
+        """
+        return [
+            decoded if isinstance(decoded, PyJWTError) else decoded["payload"]
+            for decoded in self.decode_complete_many(
+                jwts,
+                key,
+                algorithms,
+                options,
+                detached_payload=detached_payload,
+                audience=audience,
+                issuer=issuer,
+                subject=subject,
+                leeway=leeway,
+            )
+        ]
+
+    @staticmethod
+    def _normalize_options(options: dict[str, Any] | None) -> dict[str, Any]:
+        options = dict(options or {})  # shallow-copy or initialize an empty dict
+        options.setdefault("verify_signature", True)
+
+        if not options["verify_signature"]:
+            options.setdefault("verify_exp", False)
+            options.setdefault("verify_nbf", False)
+            options.setdefault("verify_iat", False)
+            options.setdefault("verify_aud", False)
+            options.setdefault("verify_iss", False)
+            options.setdefault("verify_sub", False)
+            options.setdefault("verify_jti", False)
+
+        return options
+
     def _decode_payload(self, decoded: dict[str, Any]) -> Any:
         """
         Decode the payload from a JWS dictionary (payload, signature, header).
@@ -185,7 +426,7 @@ class PyJWT:
         payloads.
         """
         try:
-            payload = json.loads(decoded["payload"])
+            payload = self.json_codec.loads(decoded["payload"])
         except ValueError as e:
             raise DecodeError(f"Invalid payload string: {e}") from e
         if not isinstance(payload, dict):
@@ -275,6 +516,9 @@ class PyJWT:
         if options["verify_jti"]:
             self._validate_jti(payload)
 
+        if self.revocation_store is not None:
+            self._validate_revocation(payload)
+
     def _validate_required_claims(
         self,
         payload: dict[str, Any],
@@ -317,6 +561,16 @@ class PyJWT:
         if not isinstance(payload.get("jti"), str):
             raise InvalidJTIError("JWT ID must be a string")
 
+    def _validate_revocation(self, payload: dict[str, Any]) -> None:
+        jti = payload.get("jti")
+        if not isinstance(jti, str):
+            return
+
+        if self.revocation_store.is_revoked(jti):  # type: ignore[union-attr]
+            if self.on_metric is not None:
+                self.on_metric("jwt.revoked_tokens", 1, {})
+            raise RevokedTokenError("Token has been revoked")
+
     def _validate_iat(
         self,
         payload: dict[str, Any],
@@ -325,7 +579,7 @@ class PyJWT:
     ) -> None:
         try:
             iat = int(payload["iat"])
-        except ValueError:
+        except (TypeError, ValueError, OverflowError):
             raise InvalidIssuedAtError(
                 "Issued At claim (iat) must be an integer."
             ) from None
@@ -340,7 +594,7 @@ class PyJWT:
     ) -> None:
         try:
             nbf = int(payload["nbf"])
-        except ValueError:
+        except (TypeError, ValueError, OverflowError):
             raise DecodeError("Not Before claim (nbf) must be an integer.") from None
 
         if nbf > (now + leeway):
@@ -354,7 +608,7 @@ class PyJWT:
     ) -> None:
         try:
             exp = int(payload["exp"])
-        except ValueError:
+        except (TypeError, ValueError, OverflowError):
             raise DecodeError(
                 "Expiration Time claim (exp) must be an integer."
             ) from None
@@ -423,11 +677,56 @@ class PyJWT:
             if payload["iss"] != issuer:
                 raise InvalidIssuerError("Invalid issuer")
         else:
-            if payload["iss"] not in issuer:
-                raise InvalidIssuerError("Invalid issuer")
+            try:
+                if payload["iss"] not in issuer:
+                    raise InvalidIssuerError("Invalid issuer")
+            except TypeError:
+                # e.g. a list iss looked up in a set of issuers
+                raise InvalidIssuerError("Invalid issuer") from None
+
+
+def _to_picklable_key(key: Any) -> Any:
+    """
+    cryptography key objects can't be pickled, so send them to worker
+    processes as unencrypted PKCS#8 PEM instead.
+    """
+    if isinstance(key, (str, bytes)) or not hasattr(key, "private_bytes"):
+        return key
+
+    from cryptography.hazmat.primitives.serialization import (
+        Encoding,
+        NoEncryption,
+        PrivateFormat,
+    )
+
+    return key.private_bytes(Encoding.PEM, PrivateFormat.PKCS8, NoEncryption())
+
+
+# Per-process state of encode_many() workers, set once by the pool initializer.
+_encode_worker_args: tuple[Any, ...] = ()
+
+
+def _init_encode_worker(
+    jwt_class: type[PyJWT], json_codec: JSONCodec, *args: Any
+) -> None:
+    global _encode_worker_args
+    _encode_worker_args = (jwt_class(json_codec=json_codec), *args)
+
+
+def _encode_in_worker(payload: dict[str, Any]) -> str:
+    jwt_obj, key, algorithm, headers, json_encoder, sort_headers = _encode_worker_args
+    return jwt_obj.encode(
+        payload, key, algorithm, headers, json_encoder, sort_headers=sort_headers
+    )
 
 
 _jwt_global_obj = PyJWT()
+# The module-level functions of both modules share one PyJWS, so its metric
+# callback and options apply to jwt.encode() and jwt.decode().
+_jwt_global_obj._jws = api_jws._jws_global_obj
 encode = _jwt_global_obj.encode
 decode_complete = _jwt_global_obj.decode_complete
 decode = _jwt_global_obj.decode
+encode_many = _jwt_global_obj.encode_many
+decode_complete_many = _jwt_global_obj.decode_complete_many
+decode_many = _jwt_global_obj.decode_many
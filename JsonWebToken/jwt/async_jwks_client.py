@@ -0,0 +1,210 @@
+import asyncio
+import json
+import urllib.request
+from ssl import SSLContext
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.error import URLError
+
+from .api_jwk import PyJWK, PyJWKSet
+from .api_jwt import decode_complete as decode_token
+from .exceptions import PyJWKClientConnectionError, PyJWKClientError
+from .jwk_set_cache import JWKSetCache
+
+
+class UrllibAsyncTransport:
+    """
+    Fetches the JWKS with ``urllib`` in the default executor, so the event
+    loop is never blocked. Used when aiohttp is not installed.
+    """
+
+    def __init__(self, ssl_context: Optional[SSLContext] = None) -> None:
+        self.ssl_context = ssl_context
+
+    async def fetch(self, uri: str, headers: Dict[str, Any], timeout: float) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._fetch, uri, headers, timeout)
+
+    def _fetch(self, uri: str, headers: Dict[str, Any], timeout: float) -> Any:
+        try:
+            r = urllib.request.Request(url=uri, headers=headers)
+            with urllib.request.urlopen(
+                r, timeout=timeout, context=self.ssl_context
+            ) as response:
+                return json.load(response)
+        except (URLError, TimeoutError) as e:
+            raise PyJWKClientConnectionError(
+                f'Fail to fetch data from the url, err: "{e}"'
+            ) from e
+
+
+class AiohttpTransport:
+    """
+    Fetches the JWKS with an ``aiohttp.ClientSession``. A session can be
+    passed in to share its connection pool; otherwise one is created on
+    first use and closed by :meth:`close`.
+    """
+
+    def __init__(
+        self, session: Any = None, ssl_context: Optional[SSLContext] = None
+    ) -> None:
+        import aiohttp
+
+        self._aiohttp = aiohttp
+        self.session = session
+        self.ssl_context = ssl_context
+        self._owns_session = session is None
+
+    async def fetch(self, uri: str, headers: Dict[str, Any], timeout: float) -> Any:
+        aiohttp = self._aiohttp
+        if self.session is None:
+            self.session = aiohttp.ClientSession()
+        try:
+            async with self.session.get(
+                uri,
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=timeout),
+                ssl=self.ssl_context if self.ssl_context is not None else True,
+            ) as response:
+                response.raise_for_status()
+                return await response.json(content_type=None)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise PyJWKClientConnectionError(
+                f'Fail to fetch data from the url, err: "{e}"'
+            ) from e
+
+    async def close(self) -> None:
+        if self._owns_session and self.session is not None:
+            await self.session.close()
+            self.session = None
+
+
+def _default_transport(ssl_context: Optional[SSLContext]) -> Any:
+    try:
+        return AiohttpTransport(ssl_context=ssl_context)
+    except ModuleNotFoundError:
+        return UrllibAsyncTransport(ssl_context=ssl_context)
+
+
+class AsyncPyJWKClient:
+    """
+    asyncio counterpart of :class:`PyJWKClient`.
+
+    The JWK Set cache is shared by all coroutines using the client, and
+    concurrent fetches are coalesced into a single request. ``transport`` is
+    any object with an ``async fetch(uri, headers, timeout)`` method returning
+    the decoded JSON document; by default aiohttp is used when installed.
+    """
+
+    def __init__(
+        self,
+        uri: str,
+        cache_jwk_set: bool = True,
+        lifespan: int = 300,
+        headers: Optional[Dict[str, Any]] = None,
+        timeout: int = 30,
+        ssl_context: Optional[SSLContext] = None,
+        transport: Any = None,
+    ):
+        if headers is None:
+            headers = {}
+        self.uri = uri
+        self.jwk_set_cache: Optional[JWKSetCache] = None
+        self.headers = headers
+        self.timeout = timeout
+        self.transport = (
+            transport if transport is not None else _default_transport(ssl_context)
+        )
+        self._fetch_task: Optional["asyncio.Future[Any]"] = None
+        self._parsed_jwk_set: Optional[Tuple[Any, PyJWKSet]] = None
+
+        if cache_jwk_set:
+            if lifespan <= 0:
+                raise PyJWKClientError(
+                    f'Lifespan must be greater than 0, the input is "{lifespan}"'
+                )
+            self.jwk_set_cache = JWKSetCache(lifespan)
+
+    async def fetch_data(self) -> Any:
+        jwk_set: Any = None
+        try:
+            jwk_set = await self.transport.fetch(self.uri, self.headers, self.timeout)
+        except (URLError, TimeoutError, asyncio.TimeoutError) as e:
+            raise PyJWKClientConnectionError(
+                f'Fail to fetch data from the url, err: "{e}"'
+            ) from e
+        else:
+            return jwk_set
+        finally:
+            if self.jwk_set_cache is not None:
+                self.jwk_set_cache.put(jwk_set)
+
+    async def _fetch_data_once(self) -> Any:
+        # Coroutines that arrive while a fetch is in flight await the same
+        # task. shield() keeps a cancelled waiter from cancelling the fetch.
+        if self._fetch_task is None:
+            self._fetch_task = asyncio.ensure_future(self._run_fetch())
+        return await asyncio.shield(self._fetch_task)
+
+    async def _run_fetch(self) -> Any:
+        try:
+            return await self.fetch_data()
+        finally:
+            self._fetch_task = None
+
+    async def get_jwk_set(self, refresh: bool = False) -> PyJWKSet:
+        data = None
+        if self.jwk_set_cache is not None and not refresh:
+            data = self.jwk_set_cache.get()
+
+        if data is None:
+            data = await self._fetch_data_once()
+
+        if not isinstance(data, dict):
+            raise PyJWKClientError("The JWKS endpoint did not return a JSON object")
+
+        parsed = self._parsed_jwk_set
+        if parsed is not None and parsed[0] is data:
+            return parsed[1]
+
+        # Only the keys that changed since the last parsed set are parsed.
+        jwk_set = PyJWKSet.from_dict(
+            data, previous=parsed[1] if parsed is not None else None
+        )
+        self._parsed_jwk_set = (data, jwk_set)
+        return jwk_set
+
+    async def get_signing_keys(self, refresh: bool = False) -> List[PyJWK]:
+        return (await self._get_signing_jwk_set(refresh)).signing_keys
+
+    async def _get_signing_jwk_set(self, refresh: bool = False) -> PyJWKSet:
+        jwk_set = await self.get_jwk_set(refresh)
+
+        if not jwk_set.signing_keys:
+            raise PyJWKClientError("The JWKS endpoint did not contain any signing keys")
+
+        return jwk_set
+
+    async def get_signing_key(self, kid: str) -> PyJWK:
+        signing_key = (await self._get_signing_jwk_set()).get_signing_key(kid)
+
+        if not signing_key:
+            # If no matching signing key from the jwk set, refresh the jwk set and try again.
+            jwk_set = await self._get_signing_jwk_set(refresh=True)
+            signing_key = jwk_set.get_signing_key(kid)
+
+            if not signing_key:
+                raise PyJWKClientError(
+                    f'Unable to find a signing key that matches: "{kid}"'
+                )
+
+        return signing_key
+
+    async def get_signing_key_from_jwt(self, token: str) -> PyJWK:
+        unverified = decode_token(token, options={"verify_signature": False})
+        header = unverified["header"]
+        return await self.get_signing_key(header.get("kid"))
+
+    async def close(self) -> None:
+        close = getattr(self.transport, "close", None)
+        if close is not None:
+            await close()
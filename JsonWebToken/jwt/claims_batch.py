@@ -0,0 +1,287 @@
+"""
+Column-wise validation of the registered claims of many decoded payloads,
+for offline audits of large token archives. Requires NumPy.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterable, Sequence
+from datetime import timedelta
+from typing import Any
+
+import numpy as np
+
+from .api_jwt import PyJWT
+from .exceptions import (
+    DecodeError,
+    ExpiredSignatureError,
+    ImmatureSignatureError,
+    InvalidAudienceError,
+    InvalidIssuedAtError,
+    InvalidIssuerError,
+    InvalidJTIError,
+    InvalidSubjectError,
+    MissingRequiredClaimError,
+    PyJWTError,
+)
+
+# Per-token error codes returned by validate_claims_batch. When a payload
+# fails several checks, the code of the check jwt.decode() would run first
+# is reported.
+VALID = 0
+MISSING_REQUIRED_CLAIM = 1
+INVALID_IAT = 2
+IMMATURE_IAT = 3
+INVALID_NBF = 4
+IMMATURE_NBF = 5
+INVALID_EXP = 6
+EXPIRED = 7
+MISSING_ISS = 8
+INVALID_ISS = 9
+MISSING_AUD = 10
+INVALID_AUD = 11
+INVALID_SUB = 12
+INVALID_JTI = 13
+
+# The exception jwt.decode() raises for each error code.
+CLAIM_ERRORS: dict[int, type[PyJWTError]] = {
+    MISSING_REQUIRED_CLAIM: MissingRequiredClaimError,
+    INVALID_IAT: InvalidIssuedAtError,
+    IMMATURE_IAT: ImmatureSignatureError,
+    INVALID_NBF: DecodeError,
+    IMMATURE_NBF: ImmatureSignatureError,
+    INVALID_EXP: DecodeError,
+    EXPIRED: ExpiredSignatureError,
+    MISSING_ISS: MissingRequiredClaimError,
+    INVALID_ISS: InvalidIssuerError,
+    MISSING_AUD: MissingRequiredClaimError,
+    INVALID_AUD: InvalidAudienceError,
+    INVALID_SUB: InvalidSubjectError,
+    INVALID_JTI: InvalidJTIError,
+}
+
+_MISSING = object()
+
+# Time claims beyond this are clamped, so they fit in a float64 column.
+_MAX_TIME = 1e300
+
+
+def validate_claims_batch(
+    payloads: Sequence[dict[str, Any]],
+    options: dict[str, Any] | None = None,
+    audience: str | Iterable[str] | None = None,
+    issuer: str | Sequence[str] | None = None,
+    subject: str | None = None,
+    leeway: float | timedelta = 0,
+    now: float | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Validates the claims of already decoded payloads, the way
+    :func:`jwt.decode` does, but a claim at a time over the whole batch.
+
+    Returns a boolean mask of the valid payloads and an ``int8`` array of
+    error codes (``VALID`` for valid payloads); :data:`CLAIM_ERRORS` maps
+    each code to the exception :func:`jwt.decode` would raise. Claim values
+    of the wrong type, which can make :func:`jwt.decode` raise ``TypeError``,
+    get the claim's ``INVALID_*`` code. All payloads are checked against the
+    same ``now``, which defaults to the current time.
+    """
+    merged_options = {**PyJWT._get_default_options(), **(options or {})}
+    if isinstance(leeway, timedelta):
+        leeway = leeway.total_seconds()
+    if audience is not None and not isinstance(audience, (str, Iterable)):
+        raise TypeError("audience must be a string, iterable or None")
+    if now is None:
+        now = time.time()
+
+    # (code, failed) pairs, in the order jwt.decode() runs the checks
+    checks: list[tuple[int, np.ndarray]] = []
+
+    for claim in merged_options["require"]:
+        checks.append(
+            (
+                MISSING_REQUIRED_CLAIM,
+                np.fromiter(
+                    (p.get(claim) is None for p in payloads),
+                    dtype=bool,
+                    count=len(payloads),
+                ),
+            )
+        )
+
+    for claim, invalid_code, failed_code in (
+        ("iat", INVALID_IAT, IMMATURE_IAT),
+        ("nbf", INVALID_NBF, IMMATURE_NBF),
+        ("exp", INVALID_EXP, EXPIRED),
+    ):
+        if not merged_options[f"verify_{claim}"]:
+            continue
+        values, invalid = _time_column(payloads, claim)
+        checks.append((invalid_code, invalid))
+        if claim == "exp":
+            # NaN (missing) compares False, so missing claims pass
+            checks.append((failed_code, values <= now - leeway))
+        else:
+            checks.append((failed_code, values > now + leeway))
+
+    if merged_options["verify_iss"] and issuer is not None:
+        checks.extend(_check_iss(payloads, issuer))
+
+    if merged_options["verify_aud"]:
+        checks.extend(
+            _check_aud(payloads, audience, merged_options.get("strict_aud", False))
+        )
+
+    if merged_options["verify_sub"]:
+        checks.append((INVALID_SUB, _check_sub(payloads, subject)))
+
+    if merged_options["verify_jti"]:
+        checks.append(
+            (
+                INVALID_JTI,
+                np.fromiter(
+                    ("jti" in p and not isinstance(p["jti"], str) for p in payloads),
+                    dtype=bool,
+                    count=len(payloads),
+                ),
+            )
+        )
+
+    codes = np.zeros(len(payloads), dtype=np.int8)
+    # Later checks are applied first, so the earliest failure wins.
+    for code, failed in reversed(checks):
+        codes[failed] = code
+
+    return codes == VALID, codes
+
+
+def _time_column(
+    payloads: Sequence[dict[str, Any]], claim: str
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the claim's values as integers in a float64 column, NaN where
+    the claim is missing or invalid, and a mask of the invalid values.
+    """
+    nan = float("nan")
+    invalid_mask = np.zeros(len(payloads), dtype=bool)
+
+    # Fast path: every value is an int, or this very NaN object if missing.
+    raw = [p.get(claim, nan) for p in payloads]
+    kinds = set(map(type, raw))
+    if kinds <= {int, float} and (
+        float not in kinds or all(v is nan for v in raw if v.__class__ is float)
+    ):
+        try:
+            return np.array(raw, dtype=np.float64), invalid_mask
+        except OverflowError:
+            pass
+
+    values: list[float] = []
+    invalid: list[int] = []
+    append = values.append
+
+    for i, payload in enumerate(payloads):
+        value = payload.get(claim, _MISSING)
+        if value is _MISSING:
+            append(nan)
+            continue
+        try:
+            value = int(value)
+        except (TypeError, ValueError, OverflowError):
+            append(nan)
+            invalid.append(i)
+            continue
+        append(min(max(value, -_MAX_TIME), _MAX_TIME))
+
+    invalid_mask[invalid] = True
+    return np.array(values, dtype=np.float64), invalid_mask
+
+
+def _check_iss(
+    payloads: Sequence[dict[str, Any]], issuer: str | Sequence[str]
+) -> list[tuple[int, np.ndarray]]:
+    n = len(payloads)
+    missing = np.zeros(n, dtype=bool)
+    failed = np.zeros(n, dtype=bool)
+    issuers = [issuer] if isinstance(issuer, str) else list(issuer)
+
+    str_index: list[int] = []
+    str_values: list[str] = []
+    for i, payload in enumerate(payloads):
+        value = payload.get("iss", _MISSING)
+        if value is _MISSING:
+            missing[i] = True
+        elif isinstance(value, str):
+            str_index.append(i)
+            str_values.append(value)
+        elif isinstance(issuer, str) or value not in issuers:
+            failed[i] = True
+
+    if str_values:
+        failed[str_index] = ~_isin(str_values, issuers)
+
+    return [(MISSING_ISS, missing), (INVALID_ISS, failed)]
+
+
+def _check_aud(
+    payloads: Sequence[dict[str, Any]],
+    audience: str | Iterable[str] | None,
+    strict: bool,
+) -> list[tuple[int, np.ndarray]]:
+    n = len(payloads)
+    present = np.fromiter((bool(p.get("aud")) for p in payloads), dtype=bool, count=n)
+
+    if audience is None:
+        # a token audience with no expected audience is rejected
+        return [(INVALID_AUD, present)]
+
+    if strict and not isinstance(audience, str):
+        return [(MISSING_AUD, ~present), (INVALID_AUD, present)]
+
+    audiences = [audience] if isinstance(audience, str) else list(audience)
+    failed = np.zeros(n, dtype=bool)
+    str_index: list[int] = []
+    str_values: list[str] = []
+    for i, payload in enumerate(payloads):
+        if not present[i]:
+            continue
+        value = payload["aud"]
+        if isinstance(value, str):
+            str_index.append(i)
+            str_values.append(value)
+        elif strict or not isinstance(value, list):
+            failed[i] = True
+        elif any(not isinstance(c, str) for c in value):
+            failed[i] = True
+        elif all(aud not in value for aud in audiences):
+            failed[i] = True
+
+    if str_values:
+        failed[str_index] = ~_isin(str_values, audiences)
+
+    return [(MISSING_AUD, ~present), (INVALID_AUD, failed)]
+
+
+def _check_sub(payloads: Sequence[dict[str, Any]], subject: str | None) -> np.ndarray:
+    values = [p.get("sub", _MISSING) for p in payloads]
+    failed = np.fromiter(
+        (v is not _MISSING and not isinstance(v, str) for v in values),
+        dtype=bool,
+        count=len(values),
+    )
+    if subject is not None:
+        failed |= np.fromiter(
+            (v is not _MISSING and v != subject for v in values),
+            dtype=bool,
+            count=len(values),
+        )
+    return failed
+
+
+def _isin(values: list[str], allowed: list[Any]) -> np.ndarray:
+    allowed_str = [a for a in allowed if isinstance(a, str)]
+    if not allowed_str:
+        return np.zeros(len(values), dtype=bool)
+    # object arrays, since fixed-width unicode arrays drop trailing NULs
+    return np.isin(np.array(values, dtype=object), np.array(allowed_str, dtype=object))
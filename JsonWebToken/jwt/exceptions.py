@@ -80,3 +80,7 @@ class InvalidSubjectError(InvalidTokenError):
 
 class InvalidJTIError(InvalidTokenError):
     pass
+
+
+class RevokedTokenError(InvalidTokenError):
+    pass
@@ -0,0 +1,139 @@
+"""
+Optional metrics for :class:`PyJWS`, :class:`PyJWT` and :class:`PyJWKClient`.
+
+Each of them accepts an ``on_metric`` callback, called as
+``on_metric(name, value, tags)``. Names ending in ``_seconds`` are stage
+durations; the others are counters and ``value`` is the increment. ``tags``
+is a dict of extra labels, such as ``{"alg": "RS256"}``.
+
+PyJWS emits ``jws.encode.header_seconds``, ``jws.encode.payload_seconds``
+(base64url of the payload), ``jws.encode.prepare_key_seconds``,
+``jws.encode.sign_seconds``, ``jws.decode.load_seconds`` (splitting, base64url
+and header JSON), ``jws.decode.prepare_key_seconds``,
+``jws.decode.verify_seconds`` and the ``jws.signature_failures`` counter.
+
+PyJWT emits ``jwt.encode.payload_json_seconds``,
+``jwt.decode.payload_json_seconds``, ``jwt.decode.claims_seconds`` and, with a
+token cache, the ``jwt.token_cache_hits`` and ``jwt.token_cache_misses``
+counters, and with a revocation store, the ``jwt.revoked_tokens`` counter.
+
+PyJWKClient emits ``jwks.fetch_seconds`` and the ``jwks.fetches``,
+``jwks.fetch_errors``, ``jwks.cache_hits`` and ``jwks.cache_misses`` counters.
+
+When no callback is set, the cost is one attribute check per stage.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+from collections import deque
+from collections.abc import Iterable
+from typing import IO, Any, Callable, Dict
+
+from . import api_jws, api_jwt
+
+MetricCallback = Callable[[str, float, Dict[str, Any]], None]
+
+
+def enable(on_metric: MetricCallback) -> None:
+    """
+    Sets ``on_metric`` on the PyJWS and PyJWT objects behind the module-level
+    functions (:func:`jwt.encode`, :func:`jwt.decode`, ...).
+    """
+    api_jws._jws_global_obj.on_metric = on_metric
+    api_jwt._jwt_global_obj.on_metric = on_metric
+
+
+def disable() -> None:
+    api_jws._jws_global_obj.on_metric = None
+    api_jwt._jwt_global_obj.on_metric = None
+
+
+class PercentileCollector:
+    """
+    A metric callback that keeps the last ``max_samples`` durations of each
+    stage and the totals of each counter, and reports duration percentiles.
+
+    Example usage:
+
+    >>> collector = PercentileCollector()
+    >>> jwt.instrumentation.enable(collector)
+    >>> ...
+    >>> collector.report()
+    """
+
+    def __init__(self, max_samples: int = 10000) -> None:
+        self.max_samples = max_samples
+        self._samples: dict[str, deque[float]] = {}
+        self._counters: dict[tuple[str, tuple[tuple[str, Any], ...]], float] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, name: str, value: float, tags: dict[str, Any]) -> None:
+        with self._lock:
+            if name.endswith("_seconds"):
+                samples = self._samples.get(name)
+                if samples is None:
+                    samples = self._samples[name] = deque(maxlen=self.max_samples)
+                samples.append(value)
+            else:
+                key = (name, tuple(sorted(tags.items())))
+                self._counters[key] = self._counters.get(key, 0) + value
+
+    def percentiles(
+        self, name: str, percents: Iterable[float] = (50, 90, 99)
+    ) -> dict[float, float]:
+        """
+        Returns the nearest-rank percentiles of the recorded durations of
+        ``name``, in seconds.
+        """
+        with self._lock:
+            samples = sorted(self._samples.get(name, ()))
+        if not samples:
+            return {}
+        n = len(samples)
+        return {
+            p: samples[min(n - 1, max(0, int(-(-p * n // 100)) - 1))] for p in percents
+        }
+
+    def counters(self) -> dict[str, float]:
+        """
+        Returns the counter totals, keyed by name and tags, e.g.
+        ``"jws.signature_failures{alg=RS256}"``.
+        """
+        with self._lock:
+            items = list(self._counters.items())
+        result = {}
+        for (name, tags), value in sorted(items, key=lambda item: str(item[0])):
+            if tags:
+                name += "{" + ",".join(f"{k}={v}" for k, v in tags) + "}"
+            result[name] = value
+        return result
+
+    def report(self, file: IO[str] | None = None) -> None:
+        """
+        Prints the count, p50, p90, p99 and max of each stage, in
+        microseconds, followed by the counters.
+        """
+        out = file if file is not None else sys.stdout
+        with self._lock:
+            names = sorted(self._samples)
+        print(
+            f"{'stage':<36}{'count':>8}{'p50':>10}{'p90':>10}{'p99':>10}{'max':>10}",
+            file=out,
+        )
+        for name in names:
+            with self._lock:
+                count = len(self._samples[name])
+            pct = self.percentiles(name, (50, 90, 99, 100))
+            if not pct:
+                continue
+            cells = "".join(f"{pct[p] * 1e6:>10.1f}" for p in (50, 90, 99, 100))
+            print(f"{name:<36}{count:>8}{cells}", file=out)
+        for name, value in self.counters().items():
+            print(f"{name:<36}{value:>8g}", file=out)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+            self._counters.clear()
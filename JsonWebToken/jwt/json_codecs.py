@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+
+def _byte_classes(classes: dict[bytes, bytes], default: bytes = b" ") -> bytes:
+    table = bytearray(default * 256)
+    for chars, cls in classes.items():
+        for c in chars:
+            table[c] = cls[0]
+    return bytes(table)
+
+
+# The checks below translate the JSON text with these tables and then use
+# substring searches, which are much faster than a regex over large payloads.
+
+# Classes of the bytes that matter to _is_stdlib_identical: number characters
+# become "0", exponent markers "e", value separators ":", and bytes json.dumps
+# would escape (DEL and non-ASCII) "!".
+_OUTPUT_CLASSES = _byte_classes(
+    {
+        b"0123456789.-": b"0",
+        b"eE": b"e",
+        b":,[": b":",
+        b"nul": b"n",
+        bytes(range(0x7F, 0x100)): b"!",
+    }
+)
+
+# Integers of 19+ digits may not fit in 64 bits, which orjson turns into
+# floats.
+_DIGIT_CLASSES = _byte_classes({b"0123456789": b"0"})
+_LARGE_INT = b"0" * 19
+
+
+# Floats are checked one by one, see _is_plain_float.
+_SCALAR_TYPES = frozenset({str, int, bool, type(None)})
+_CONTAINER_TYPES = frozenset({dict, list, tuple})
+_CHECKED_TYPES = _CONTAINER_TYPES | {float}
+_NATIVE_TYPES = _SCALAR_TYPES | _CHECKED_TYPES
+_KEY_TYPES = frozenset({str})
+
+
+def _is_plain_float(value: float) -> bool:
+    """
+    Returns True if json.dumps writes ``value`` without an exponent. Fast
+    encoders write such floats with the same shortest round-trip digits, but
+    differ on where exponents start (e.g. 5e-05 vs 0.00005), so other floats,
+    and NaN and Infinity, are left to json.
+    """
+    return value == 0 or 1e-4 <= abs(value) < 1e16
+
+
+def _is_json_native(obj: Any) -> bool:
+    """
+    Returns True if ``obj`` only holds dicts with str keys, lists, tuples
+    and scalars of exactly the types json.dumps serializes natively. Fast
+    encoders also accept other types (e.g. UUID, Decimal, datetime or set)
+    which json.dumps rejects, or render subclasses such as Enum members
+    differently, so anything else is left to json.
+    """
+    obj_type = type(obj)
+    if obj_type is dict:
+        if not set(map(type, obj)) <= _KEY_TYPES:
+            return False
+        values: Any = obj.values()
+    elif obj_type is list or obj_type is tuple:
+        values = obj
+    elif obj_type is float:
+        return _is_plain_float(obj)
+    else:
+        return obj_type in _SCALAR_TYPES
+
+    # the element types are collected first, so only nested containers and
+    # floats are checked in Python
+    value_types = set(map(type, values))
+    if value_types <= _SCALAR_TYPES:
+        return True
+    if not value_types <= _NATIVE_TYPES:
+        return False
+    return all(
+        _is_json_native(value) for value in values if type(value) in _CHECKED_TYPES
+    )
+
+
+def _is_stdlib_identical(data: bytes) -> bool:
+    """
+    Returns False if a fast encoder's output may differ from json.dumps:
+    bytes json.dumps would escape, exponent floats ("1e16" vs "1e+16") or
+    null values (NaN and Infinity are written as null). False positives,
+    e.g. from string contents, only cost a fallback to json.
+    """
+    # a leading separator, so top-level values look like the others
+    classes = b":" + data.translate(_OUTPUT_CLASSES)
+    if b"!" in classes or b":nnnn" in classes:
+        return False
+    # an exponent is a run of number characters right after a separator
+    i = classes.find(b"0e")
+    while i != -1:
+        start = i
+        while classes[start] == 0x30:
+            start -= 1
+        if classes[start] == 0x3A:
+            return False
+        i = classes.find(b"0e", i + 2)
+    return True
+
+
+class JSONCodec:
+    """
+    Serializes JWT headers and payloads with the standard library ``json``.
+
+    Subclasses use a faster library, but must produce exactly the bytes
+    ``json.dumps`` would, and parse exactly what ``json.loads`` would, so
+    tokens and signatures don't depend on the installed backend. Objects
+    holding anything but JSON-native types are always serialized by
+    ``json``, so they fail or use ``json_encoder`` as before.
+    """
+
+    name = "json"
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Rebuilt on unpickling, so PyJWS/PyJWT objects can be sent to worker
+        # processes (see PyJWT.encode_many).
+        return (type(self), ())
+
+    def dumps(self, obj: Any, sort_keys: bool = False) -> bytes:
+        return json.dumps(obj, separators=(",", ":"), sort_keys=sort_keys).encode(
+            "utf-8"
+        )
+
+    def loads(self, data: bytes | str) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    name = "orjson"
+
+    def __init__(self) -> None:
+        import orjson
+
+        self._orjson = orjson
+
+    def dumps(self, obj: Any, sort_keys: bool = False) -> bytes:
+        try:
+            if not _is_json_native(obj):
+                return super().dumps(obj, sort_keys)
+            data = self._orjson.dumps(
+                obj, option=self._orjson.OPT_SORT_KEYS if sort_keys else None
+            )
+        except (TypeError, RecursionError):
+            return super().dumps(obj, sort_keys)
+        if not _is_stdlib_identical(data):
+            return super().dumps(obj, sort_keys)
+        return data
+
+    def loads(self, data: bytes | str) -> Any:
+        if isinstance(data, bytes) and _LARGE_INT not in data.translate(_DIGIT_CLASSES):
+            try:
+                return self._orjson.loads(data)
+            except ValueError:
+                # e.g. NaN literals or lone surrogates, which json accepts
+                pass
+        return super().loads(data)
+
+
+class MsgspecCodec(JSONCodec):
+    name = "msgspec"
+
+    def __init__(self) -> None:
+        import msgspec
+
+        self._msgspec = msgspec
+        self._encoder = msgspec.json.Encoder()
+        self._sorted_encoder = msgspec.json.Encoder(order="sorted")
+        self._decoder = msgspec.json.Decoder()
+
+    def dumps(self, obj: Any, sort_keys: bool = False) -> bytes:
+        encoder = self._sorted_encoder if sort_keys else self._encoder
+        try:
+            if not _is_json_native(obj):
+                return super().dumps(obj, sort_keys)
+            data = encoder.encode(obj)
+        except (TypeError, ValueError, OverflowError, RecursionError):
+            return super().dumps(obj, sort_keys)
+        if not _is_stdlib_identical(data):
+            return super().dumps(obj, sort_keys)
+        return data
+
+    def loads(self, data: bytes | str) -> Any:
+        if isinstance(data, bytes):
+            try:
+                return self._decoder.decode(data)
+            except self._msgspec.DecodeError:
+                pass
+        return super().loads(data)
+
+
+def get_default_json_codec() -> JSONCodec:
+    """
+    Returns the fastest available codec: msgspec, then orjson, then json.
+    msgspec comes first since it decodes large integers exactly, so its
+    input doesn't need to be scanned for them.
+    """
+    for codec_class in (MsgspecCodec, OrjsonCodec):
+        try:
+            return codec_class()
+        except ImportError:
+            continue
+    return JSONCodec()
@@ -1,31 +1,182 @@
+import json
+import os
+import tempfile
+import threading
 import time
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
 
-from .api_jwk import PyJWKSet, PyJWTSetWithTimestamp
+from .api_jwk import PyJWTSetWithTimestamp
 
 
 class JWKSetCache:
-    def __init__(self, lifespan: int) -> None:
+    """
+    Holds the last fetched JWKS document, as returned by
+    :meth:`PyJWKClient.fetch_data`, for ``lifespan`` seconds.
+    """
+
+    def __init__(
+        self,
+        lifespan: int,
+        stale_grace_period: float = 0,
+        hard_expiry: Optional[float] = None,
+    ) -> None:
         self.jwk_set_with_timestamp: Optional[PyJWTSetWithTimestamp] = None
         self.lifespan = lifespan
+        # Seconds past the lifespan during which an expired set may still be
+        # served while it is refreshed in the background.
+        self.stale_grace_period = stale_grace_period
+        # Maximum age, in seconds, of a set served while refreshes keep
+        # failing. Never shorter than lifespan + stale_grace_period.
+        self.hard_expiry = max(hard_expiry or 0, lifespan + stale_grace_period)
+        self.refresh_failed = False
+        # Lifespan of the current set when given to put(), e.g. from the
+        # response's Cache-Control max-age.
+        self.entry_lifespan: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def put(
+        self,
+        jwk_set: Optional[Dict[str, Any]],
+        age: float = 0,
+        lifespan: Optional[float] = None,
+    ) -> None:
+        with self._lock:
+            if jwk_set is not None:
+                self.jwk_set_with_timestamp = PyJWTSetWithTimestamp(jwk_set)
+                self.jwk_set_with_timestamp.timestamp -= age
+                self.entry_lifespan = lifespan
+                self.refresh_failed = False
+            elif self.stale_grace_period > 0:
+                # keep serving the stale set, up to the hard expiry
+                self.refresh_failed = True
+            else:
+                # clear cache
+                self.jwk_set_with_timestamp = None
+
+    def get(self) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            jwk_set_with_timestamp = self.jwk_set_with_timestamp
+        if jwk_set_with_timestamp is None or self._is_expired(jwk_set_with_timestamp):
+            return None
 
-    def put(self, jwk_set: PyJWKSet) -> None:
-        if jwk_set is not None:
-            self.jwk_set_with_timestamp = PyJWTSetWithTimestamp(jwk_set)
-        else:
-            # clear cache
-            self.jwk_set_with_timestamp = None
+        return jwk_set_with_timestamp.get_jwk_set()
 
-    def get(self) -> Optional[PyJWKSet]:
-        if self.jwk_set_with_timestamp is None or self.is_expired():
+    def get_stale(self) -> Optional[Dict[str, Any]]:
+        """
+        Returns the cached set even if it has expired, as long as it is within
+        the stale grace period (or the hard expiry, if refreshing has failed).
+        """
+        with self._lock:
+            jwk_set_with_timestamp = self.jwk_set_with_timestamp
+            refresh_failed = self.refresh_failed
+            lifespan = self._current_lifespan()
+        if jwk_set_with_timestamp is None:
             return None
 
-        return self.jwk_set_with_timestamp.get_jwk_set()
+        if self.lifespan > -1:
+            age = time.monotonic() - jwk_set_with_timestamp.get_timestamp()
+            max_age = (
+                max(self.hard_expiry, lifespan + self.stale_grace_period)
+                if refresh_failed
+                else lifespan + self.stale_grace_period
+            )
+            if age > max_age:
+                return None
+
+        return jwk_set_with_timestamp.get_jwk_set()
 
     def is_expired(self) -> bool:
+        jwk_set_with_timestamp = self.jwk_set_with_timestamp
+        return jwk_set_with_timestamp is not None and self._is_expired(
+            jwk_set_with_timestamp
+        )
+
+    def _is_expired(self, jwk_set_with_timestamp: PyJWTSetWithTimestamp) -> bool:
         return (
-            self.jwk_set_with_timestamp is not None
-            and self.lifespan > -1
+            self.lifespan > -1
             and time.monotonic()
-            > self.jwk_set_with_timestamp.get_timestamp() + self.lifespan
+            > jwk_set_with_timestamp.get_timestamp() + self._current_lifespan()
         )
+
+    def _current_lifespan(self) -> float:
+        entry_lifespan = self.entry_lifespan
+        return self.lifespan if entry_lifespan is None else entry_lifespan
+
+
+class FileJWKSetCache:
+    """
+    Stores the raw JWKS document and its fetch time in a file, so a new
+    process can start from the last fetched key set. The file is replaced
+    atomically, so readers never see a partial write.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def load(self, uri: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        """
+        Returns the stored JWKS for ``uri`` and its age in seconds, or None
+        if there is no usable file.
+        """
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                doc = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if not isinstance(doc, dict) or doc.get("uri") != uri:
+            return None
+
+        fetched_at = doc.get("fetched_at")
+        jwks = doc.get("jwks")
+        if not isinstance(fetched_at, (int, float)) or not isinstance(jwks, dict):
+            return None
+
+        return jwks, max(time.time() - fetched_at, 0.0)
+
+    def save(self, uri: str, jwks: Dict[str, Any]) -> None:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".jwks-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"uri": uri, "fetched_at": time.time(), "jwks": jwks}, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+
+class RefreshMetrics:
+    """
+    Counters and latencies of the JWKS fetches made by a PyJWKClient.
+    """
+
+    def __init__(self) -> None:
+        self.refreshes = 0
+        self.failures = 0
+        self.background_refreshes = 0
+        self.stale_hits = 0
+        self.last_latency: Optional[float] = None
+        self.max_latency = 0.0
+        self.total_latency = 0.0
+        self.last_error: Optional[Exception] = None
+
+    def record(self, latency: float, error: Optional[Exception] = None) -> None:
+        self.refreshes += 1
+        self.last_latency = latency
+        self.max_latency = max(self.max_latency, latency)
+        self.total_latency += latency
+        if error is not None:
+            self.failures += 1
+            self.last_error = error
+
+    @property
+    def mean_latency(self) -> Optional[float]:
+        if not self.refreshes:
+            return None
+        return self.total_latency / self.refreshes
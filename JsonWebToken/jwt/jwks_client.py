@@ -1,17 +1,239 @@
+import http.client
 import json
+import threading
+import time
 import urllib.request
+from email.message import Message
 from functools import lru_cache
 from ssl import SSLContext
-from typing import Any, Dict, List, Optional
-from urllib.error import URLError
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.error import HTTPError, URLError
+from urllib.parse import urljoin, urlsplit
 
 from .api_jwk import PyJWK, PyJWKSet
 from .api_jwt import decode_complete as decode_token
-from .exceptions import PyJWKClientConnectionError, PyJWKClientError
-from .jwk_set_cache import JWKSetCache
+from .exceptions import PyJWKClientConnectionError, PyJWKClientError, PyJWTError
+from .jwk_set_cache import FileJWKSetCache, JWKSetCache, RefreshMetrics
+
+
+class JWKSResponse:
+    """
+    The result of a JWKS request made by a transport: the decoded JSON
+    document, or ``not_modified`` for a 304 response, with the caching
+    headers of the response.
+    """
+
+    def __init__(
+        self,
+        data: Any = None,
+        etag: Optional[str] = None,
+        max_age: Optional[float] = None,
+        age: float = 0,
+        not_modified: bool = False,
+    ) -> None:
+        self.data = data
+        self.etag = etag
+        self.max_age = max_age
+        self.age = age
+        self.not_modified = not_modified
+
+    @classmethod
+    def from_headers(
+        cls, headers: Message, data: Any = None, not_modified: bool = False
+    ) -> "JWKSResponse":
+        etag = headers.get("ETag")
+        max_age: Optional[float] = None
+        cache_control = headers.get("Cache-Control")
+        if isinstance(cache_control, str):
+            for directive in cache_control.split(","):
+                name, _, value = directive.strip().partition("=")
+                if name.lower() in ("no-cache", "no-store"):
+                    max_age = 0
+                    break
+                if name.lower() == "max-age":
+                    try:
+                        max_age = max(int(value.strip('"')), 0)
+                    except ValueError:
+                        pass
+        age = headers.get("Age")
+        return cls(
+            data,
+            etag=etag if isinstance(etag, str) else None,
+            max_age=max_age,
+            age=int(age) if isinstance(age, str) and age.isdigit() else 0,
+            not_modified=not_modified,
+        )
+
+
+class UrllibTransport:
+    """
+    Fetches the JWKS with ``urllib.request.urlopen``, opening a new
+    connection for each request. Honours proxy environment variables.
+    """
+
+    def __init__(self, ssl_context: Optional[SSLContext] = None) -> None:
+        self.ssl_context = ssl_context
+
+    def fetch(self, uri: str, headers: Dict[str, Any], timeout: float) -> JWKSResponse:
+        try:
+            r = urllib.request.Request(url=uri, headers=headers)
+            with urllib.request.urlopen(
+                r, timeout=timeout, context=self.ssl_context
+            ) as response:
+                data = json.load(response)
+                return JWKSResponse.from_headers(response.headers, data)
+        except HTTPError as e:
+            if e.code == 304:
+                return JWKSResponse.from_headers(e.headers, not_modified=True)
+            raise PyJWKClientConnectionError(
+                f'Fail to fetch data from the url, err: "{e}"'
+            ) from e
+        except (URLError, TimeoutError) as e:
+            raise PyJWKClientConnectionError(
+                f'Fail to fetch data from the url, err: "{e}"'
+            ) from e
+
+    def close(self) -> None:
+        pass
+
+
+class KeepAliveTransport:
+    """
+    Fetches the JWKS over persistent HTTP/1.1 connections, kept open between
+    requests so refreshes skip the TCP and TLS handshakes. One transport can
+    be shared by several clients (see :class:`PyJWKRouter`); it keeps up to
+    ``max_idle_connections`` idle connections per host. Proxy environment
+    variables are not used.
+    """
+
+    max_idle_connections = 4
+    max_redirects = 5
+
+    def __init__(self, ssl_context: Optional[SSLContext] = None) -> None:
+        self.ssl_context = ssl_context
+        self._idle: Dict[Tuple[str, str, int], List[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+
+    def fetch(self, uri: str, headers: Dict[str, Any], timeout: float) -> JWKSResponse:
+        for _ in range(self.max_redirects + 1):
+            response, body = self._request(uri, headers, timeout)
+            location = response.getheader("Location")
+            if response.status in (301, 302, 303, 307, 308) and location:
+                uri = urljoin(uri, location)
+                continue
+            break
+
+        if response.status == 304:
+            return JWKSResponse.from_headers(response.msg, not_modified=True)
+        if response.status != 200:
+            raise PyJWKClientConnectionError(
+                "Fail to fetch data from the url, err: "
+                f'"HTTP Error {response.status}: {response.reason}"'
+            )
+        return JWKSResponse.from_headers(response.msg, json.loads(body))
+
+    def _request(
+        self, uri: str, headers: Dict[str, Any], timeout: float
+    ) -> Tuple[http.client.HTTPResponse, bytes]:
+        parts = urlsplit(uri)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise PyJWKClientConnectionError(
+                f'Fail to fetch data from the url, err: "unsupported url: {uri}"'
+            )
+        key = (
+            parts.scheme,
+            parts.hostname,
+            parts.port or (443 if parts.scheme == "https" else 80),
+        )
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+
+        conn = self._acquire(key)
+        reused = conn is not None
+        while True:
+            if conn is None:
+                conn = self._connect(key, timeout)
+            try:
+                conn.timeout = timeout
+                if conn.sock is not None:
+                    conn.sock.settimeout(timeout)
+                conn.request("GET", path, headers=headers)
+                response = conn.getresponse()
+                body = response.read()
+            except (http.client.HTTPException, OSError) as e:
+                conn.close()
+                conn = None
+                if reused and isinstance(
+                    e,
+                    (
+                        http.client.RemoteDisconnected,
+                        ConnectionResetError,
+                        BrokenPipeError,
+                    ),
+                ):
+                    # the server closed the idle connection; retry once on a
+                    # new one
+                    reused = False
+                    continue
+                raise PyJWKClientConnectionError(
+                    f'Fail to fetch data from the url, err: "{e}"'
+                ) from e
+            break
+
+        if response.will_close:
+            conn.close()
+        else:
+            self._release(key, conn)
+        return response, body
+
+    def _connect(
+        self, key: Tuple[str, str, int], timeout: float
+    ) -> http.client.HTTPConnection:
+        scheme, host, port = key
+        if scheme == "https":
+            return http.client.HTTPSConnection(
+                host, port, timeout=timeout, context=self.ssl_context
+            )
+        return http.client.HTTPConnection(host, port, timeout=timeout)
+
+    def _acquire(
+        self, key: Tuple[str, str, int]
+    ) -> Optional[http.client.HTTPConnection]:
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop()
+        return None
+
+    def _release(
+        self, key: Tuple[str, str, int], conn: http.client.HTTPConnection
+    ) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_connections:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def close(self) -> None:
+        """
+        Closes the idle connections.
+        """
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
 
 
 class PyJWKClient:
+    # Upper bound on the number of unknown kids remembered at once.
+    max_missing_kids = 1024
+    # Seconds after a failed fetch during which no background refresh is
+    # started (at least min_refresh_interval).
+    refresh_retry_delay = 5.0
+
     def __init__(
         self,
         uri: str,
@@ -22,6 +244,19 @@ class PyJWKClient:
         headers: Optional[Dict[str, Any]] = None,
         timeout: int = 30,
         ssl_context: Optional[SSLContext] = None,
+        min_refresh_interval: float = 0,
+        missing_kid_ttl: float = 0,
+        stale_grace_period: float = 0,
+        hard_expiry: Optional[float] = None,
+        on_refresh: Optional[
+            Callable[[float, Optional[PyJWKClientError]], None]
+        ] = None,
+        cache_path: Optional[str] = None,
+        cache_path_max_age: float = 86400,
+        on_metric: Optional[Callable[[str, float, Dict[str, Any]], None]] = None,
+        transport: Any = None,
+        use_cache_control: bool = False,
+        keep_jwk_data: bool = True,
     ):
         if headers is None:
             headers = {}
@@ -30,6 +265,47 @@ class PyJWKClient:
         self.headers = headers
         self.timeout = timeout
         self.ssl_context = ssl_context
+        # Any object with a ``fetch(uri, headers, timeout)`` method returning
+        # a JWKSResponse, e.g. a KeepAliveTransport shared by several clients.
+        self.transport = (
+            transport if transport is not None else UrllibTransport(ssl_context)
+        )
+        # Use the response's Cache-Control max-age as the cache lifespan.
+        self.use_cache_control = use_cache_control
+        # The ETag of the last fetched JWKS and that JWKS, for conditional
+        # requests: a 304 response reuses it without parsing it again.
+        self._etag: Optional[Tuple[str, Any]] = None
+        # With False, the parsed keys don't keep their raw JWK (see PyJWK).
+        self.keep_jwk_data = keep_jwk_data
+        # Forced refreshes (kid misses) within this many seconds of the last
+        # fetch reuse the last fetched JWKS instead of hitting the endpoint.
+        self.min_refresh_interval = min_refresh_interval
+        # Kids that were still missing after a refresh are rejected without
+        # refetching for this many seconds, or until a fetch returns them.
+        self.missing_kid_ttl = missing_kid_ttl
+
+        # Only one thread fetches at a time; threads that waited for it
+        # reuse its result (or error) instead of fetching again.
+        self._fetch_lock = threading.Lock()
+        self._fetch_count = 0
+        self._last_fetch_time: Optional[float] = None
+        self._last_fetch_data: Any = None
+        self._last_fetch_error: Optional[PyJWKClientError] = None
+        self._last_failure_time: Optional[float] = None
+        self._missing_kids: Dict[str, float] = {}
+        self._missing_kids_lock = threading.Lock()
+        # The last parsed JWKS and the raw data it was parsed from, so cache
+        # hits don't rebuild every PyJWK.
+        self._parsed_jwk_set: Optional[Tuple[Any, PyJWKSet]] = None
+
+        # Fetch latency and failure counters. ``on_refresh`` is also called
+        # after every fetch with its latency and error (or None).
+        self.refresh_metrics = RefreshMetrics()
+        self.on_refresh = on_refresh
+        # Receives fetch timings and cache counters, see jwt.instrumentation.
+        self.on_metric = on_metric
+        self._background_refresh: Optional[threading.Thread] = None
+        self._background_refresh_lock = threading.Lock()
 
         if cache_jwk_set:
             # Init jwt set cache with default or given lifespan.
@@ -38,10 +314,23 @@ class PyJWKClient:
                 raise PyJWKClientError(
                     f'Lifespan must be greater than 0, the input is "{lifespan}"'
                 )
-            self.jwk_set_cache = JWKSetCache(lifespan)
+            self.jwk_set_cache = JWKSetCache(
+                lifespan,
+                stale_grace_period=stale_grace_period,
+                hard_expiry=hard_expiry,
+            )
         else:
             self.jwk_set_cache = None
 
+        # Optional on-disk copy of the last fetched JWKS, used to start
+        # without blocking on a fetch.
+        self.file_cache: Optional[FileJWKSetCache] = None
+        self._startup_data: Any = None
+        self._startup_data_expires_at = 0.0
+        if cache_path is not None:
+            self.file_cache = FileJWKSetCache(cache_path)
+            self._load_file_cache(cache_path_max_age)
+
         if cache_keys:
             # Cache signing keys
             # Ignore mypy (https://github.com/python/mypy/issues/2427)
@@ -51,64 +340,278 @@ class PyJWKClient:
 
     def fetch_data(self) -> Any:
         jwk_set: Any = None
+        response: Optional[JWKSResponse] = None
         try:
-            r = urllib.request.Request(url=self.uri, headers=self.headers)
-            with urllib.request.urlopen(
-                r, timeout=self.timeout, context=self.ssl_context
-            ) as response:
-                jwk_set = json.load(response)
-        except (URLError, TimeoutError) as e:
-            raise PyJWKClientConnectionError(
-                f'Fail to fetch data from the url, err: "{e}"'
-            ) from e
+            etag = self._etag
+            headers = self.headers
+            if etag is not None:
+                headers = {**headers, "If-None-Match": etag[0]}
+            response = self.transport.fetch(self.uri, headers, self.timeout)
+            if response.not_modified:
+                if etag is None:
+                    raise PyJWKClientConnectionError(
+                        "Fail to fetch data from the url, err: "
+                        '"unexpected 304 response"'
+                    )
+                jwk_set = etag[1]
+            else:
+                jwk_set = response.data
+                self._etag = (
+                    (response.etag, jwk_set) if response.etag is not None else None
+                )
+        except PyJWKClientError:
+            self._etag = None
+            raise
         else:
             return jwk_set
         finally:
             if self.jwk_set_cache is not None:
-                self.jwk_set_cache.put(jwk_set)
+                if response is not None and self.use_cache_control:
+                    self.jwk_set_cache.put(
+                        jwk_set, age=response.age, lifespan=response.max_age
+                    )
+                else:
+                    self.jwk_set_cache.put(jwk_set)
 
     def get_jwk_set(self, refresh: bool = False) -> PyJWKSet:
         data = None
         if self.jwk_set_cache is not None and not refresh:
             data = self.jwk_set_cache.get()
+            if self.on_metric is not None:
+                self.on_metric(
+                    "jwks.cache_hits" if data is not None else "jwks.cache_misses",
+                    1,
+                    {},
+                )
+
+            if data is None and self.jwk_set_cache.stale_grace_period > 0:
+                # Serve the expired set while a background thread refreshes it.
+                data = self.jwk_set_cache.get_stale()
+                if data is not None:
+                    self.refresh_metrics.stale_hits += 1
+                    self._refresh_in_background()
+
+        if data is None and self._startup_data is not None and not refresh:
+            if time.monotonic() < self._startup_data_expires_at:
+                # Serve the on-disk copy while a background thread refreshes it.
+                data = self._startup_data
+                self._refresh_in_background()
+            else:
+                self._startup_data = None
 
         if data is None:
-            data = self.fetch_data()
+            data = self._fetch_data_once(refresh)
 
         if not isinstance(data, dict):
             raise PyJWKClientError("The JWKS endpoint did not return a JSON object")
 
-        return PyJWKSet.from_dict(data)
+        parsed = self._parsed_jwk_set
+        if parsed is not None and parsed[0] is data:
+            return parsed[1]
+
+        # Only the keys that changed since the last parsed set are parsed.
+        jwk_set = PyJWKSet.from_dict(
+            data,
+            previous=parsed[1] if parsed is not None else None,
+            keep_jwk_data=self.keep_jwk_data,
+        )
+        self._parsed_jwk_set = (data, jwk_set)
+        if jwk_set.removed_keys:
+            # get_signing_key's lru_cache (cache_keys=True) would keep serving
+            # the removed keys.
+            cache_clear = getattr(self.get_signing_key, "cache_clear", None)
+            if cache_clear is not None:
+                cache_clear()
+        return jwk_set
+
+    def _fetch_data_once(self, refresh: bool) -> Any:
+        fetch_count = self._fetch_count
+        with self._fetch_lock:
+            if self._fetch_count != fetch_count:
+                # Another thread fetched while this one was waiting.
+                if self._last_fetch_error is not None:
+                    raise self._last_fetch_error
+                return self._last_fetch_data
+
+            if (
+                refresh
+                and self._last_fetch_data is not None
+                and self._last_fetch_time is not None
+                and time.monotonic() - self._last_fetch_time < self.min_refresh_interval
+            ):
+                return self._last_fetch_data
+
+            start = time.monotonic()
+            try:
+                data = self.fetch_data()
+            except PyJWKClientError as e:
+                self._last_fetch_data = None
+                self._last_fetch_error = e
+                self._last_failure_time = time.monotonic()
+                self._record_refresh(time.monotonic() - start, e)
+                raise
+            else:
+                self._record_refresh(time.monotonic() - start, None)
+                self._last_fetch_data = data
+                self._last_fetch_error = None
+                self._last_failure_time = None
+                self._startup_data = None
+                if self.file_cache is not None and isinstance(data, dict):
+                    try:
+                        self.file_cache.save(self.uri, data)
+                    except OSError:
+                        # The on-disk copy is only an optimization.
+                        pass
+                self._discard_missing_kids(data)
+                return data
+            finally:
+                self._last_fetch_time = time.monotonic()
+                self._fetch_count += 1
+
+    def _load_file_cache(self, max_age: float) -> None:
+        assert self.file_cache is not None
+        loaded = self.file_cache.load(self.uri)
+        if loaded is None:
+            return
+
+        data, age = loaded
+        if age > max_age:
+            return
+
+        try:
+            jwk_set = PyJWKSet.from_dict(data, keep_jwk_data=self.keep_jwk_data)
+        except PyJWTError:
+            return
+        self._parsed_jwk_set = (data, jwk_set)
+
+        if self.jwk_set_cache is not None and age < self.jwk_set_cache.lifespan:
+            self.jwk_set_cache.put(data, age=age)
+        else:
+            self._startup_data = data
+            self._startup_data_expires_at = time.monotonic() + max_age - age
+
+    def _record_refresh(
+        self, latency: float, error: Optional[PyJWKClientError]
+    ) -> None:
+        self.refresh_metrics.record(latency, error)
+        if self.on_refresh is not None:
+            self.on_refresh(latency, error)
+        if self.on_metric is not None:
+            self.on_metric("jwks.fetch_seconds", latency, {})
+            self.on_metric("jwks.fetches", 1, {})
+            if error is not None:
+                self.on_metric("jwks.fetch_errors", 1, {})
+
+    def _is_backing_off(self) -> bool:
+        # Without this, each lookup would start a new refresh as soon as the
+        # previous one failed, hammering a JWKS endpoint that is down.
+        last_failure_time = self._last_failure_time
+        return (
+            last_failure_time is not None
+            and time.monotonic() - last_failure_time
+            < max(self.refresh_retry_delay, self.min_refresh_interval)
+        )
+
+    def _refresh_in_background(self) -> None:
+        if self._is_backing_off():
+            return
+
+        with self._background_refresh_lock:
+            if (
+                self._background_refresh is not None
+                and self._background_refresh.is_alive()
+            ):
+                return
+
+            self.refresh_metrics.background_refreshes += 1
+            self._background_refresh = threading.Thread(
+                target=self._background_refresh_target,
+                name="PyJWKClient-refresh",
+                daemon=True,
+            )
+            self._background_refresh.start()
+
+    def _background_refresh_target(self) -> None:
+        try:
+            self._fetch_data_once(refresh=False)
+        except PyJWKClientError:
+            # Already recorded in refresh_metrics; the stale set keeps being
+            # served until the cache's hard expiry.
+            pass
 
     def get_signing_keys(self, refresh: bool = False) -> List[PyJWK]:
+        return self._get_signing_jwk_set(refresh).signing_keys
+
+    def _get_signing_jwk_set(self, refresh: bool = False) -> PyJWKSet:
         jwk_set = self.get_jwk_set(refresh)
-        signing_keys = [
-            jwk_set_key
-            for jwk_set_key in jwk_set.keys
-            if jwk_set_key.public_key_use in ["sig", None] and jwk_set_key.key_id
-        ]
 
-        if not signing_keys:
+        if not jwk_set.signing_keys:
             raise PyJWKClientError("The JWKS endpoint did not contain any signing keys")
 
-        return signing_keys
+        return jwk_set
 
     def get_signing_key(self, kid: str) -> PyJWK:
-        signing_keys = self.get_signing_keys()
-        signing_key = self.match_kid(signing_keys, kid)
+        signing_key = self._get_signing_jwk_set().get_signing_key(kid)
 
         if not signing_key:
+            if self._is_missing_kid(kid):
+                raise PyJWKClientError(
+                    f'Unable to find a signing key that matches: "{kid}"'
+                )
+
             # If no matching signing key from the jwk set, refresh the jwk set and try again.
-            signing_keys = self.get_signing_keys(refresh=True)
-            signing_key = self.match_kid(signing_keys, kid)
+            signing_key = self._get_signing_jwk_set(refresh=True).get_signing_key(kid)
 
             if not signing_key:
+                self._add_missing_kid(kid)
                 raise PyJWKClientError(
                     f'Unable to find a signing key that matches: "{kid}"'
                 )
 
         return signing_key
 
+    def _is_missing_kid(self, kid: str) -> bool:
+        if self.missing_kid_ttl <= 0 or not isinstance(kid, str):
+            return False
+
+        with self._missing_kids_lock:
+            expires_at = self._missing_kids.get(kid)
+            if expires_at is None:
+                return False
+            if time.monotonic() >= expires_at:
+                del self._missing_kids[kid]
+                return False
+            return True
+
+    def _discard_missing_kids(self, data: Any) -> None:
+        # Only the kids the fetched JWKS now has are forgotten, so a flood of
+        # unknown kids still can't trigger a fetch per missing-kid TTL each.
+        if not self._missing_kids or not isinstance(data, dict):
+            return
+        keys = data.get("keys")
+        if not isinstance(keys, list):
+            return
+
+        with self._missing_kids_lock:
+            for key in keys:
+                kid = key.get("kid") if isinstance(key, dict) else None
+                if isinstance(kid, str):
+                    self._missing_kids.pop(kid, None)
+
+    def _add_missing_kid(self, kid: str) -> None:
+        if self.missing_kid_ttl <= 0 or not isinstance(kid, str):
+            return
+
+        now = time.monotonic()
+        with self._missing_kids_lock:
+            if len(self._missing_kids) >= self.max_missing_kids:
+                self._missing_kids = {
+                    k: v for k, v in self._missing_kids.items() if v > now
+                }
+                while len(self._missing_kids) >= self.max_missing_kids:
+                    del self._missing_kids[next(iter(self._missing_kids))]
+            self._missing_kids[kid] = now + self.missing_kid_ttl
+
     def get_signing_key_from_jwt(self, token: str) -> PyJWK:
         unverified = decode_token(token, options={"verify_signature": False})
         header = unverified["header"]
@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterable, Mapping, Sequence
+from datetime import timedelta
+from typing import Any, Union
+
+from . import api_jws, api_jwt
+from .api_jwk import PyJWK
+from .exceptions import (
+    DecodeError,
+    InvalidIssuerError,
+    MissingRequiredClaimError,
+    PyJWKClientError,
+)
+from .jwks_client import KeepAliveTransport, PyJWKClient
+
+IssuerConfig = Union[str, Mapping[str, Any], PyJWKClient]
+
+
+class PyJWKRouter:
+    """
+    Verifies tokens from several issuers, each with its own JWKS endpoint.
+
+    ``issuers`` maps each accepted ``iss`` value to its JWKS URI, to a dict
+    of :class:`PyJWKClient` arguments (``{"uri": ..., "lifespan": ...}``)
+    or to a ready client. Clients are created on first use, with
+    ``client_options`` as defaults for the per-issuer arguments, so each
+    issuer keeps its own key cache and refresh policy. Unless a
+    ``transport`` is given, the clients share one
+    :class:`~jwt.jwks_client.KeepAliveTransport`, and so its connections;
+    issuers configured with their own ``ssl_context`` get their own.
+
+    The token is parsed once: its unverified ``iss`` claim selects the
+    client and its ``kid`` header the key, then the signature and claims
+    are checked on the already parsed segments.
+
+    Example usage:
+
+    >>> router = jwt.PyJWKRouter(
+    ...     {
+    ...         "https://idp-a.example/": "https://idp-a.example/jwks.json",
+    ...         "https://idp-b.example/": {
+    ...             "uri": "https://idp-b.example/keys",
+    ...             "lifespan": 60,
+    ...         },
+    ...     },
+    ...     algorithms=["RS256", "ES256"],
+    ...     audience="api",
+    ... )
+    >>> payload = router.decode(token)
+    """
+
+    def __init__(
+        self,
+        issuers: Mapping[str, IssuerConfig] | None = None,
+        algorithms: Sequence[str] | None = None,
+        options: dict[str, Any] | None = None,
+        audience: str | Iterable[str] | None = None,
+        leeway: float | timedelta = 0,
+        jwt_obj: api_jwt.PyJWT | None = None,
+        jws_obj: api_jws.PyJWS | None = None,
+        **client_options: Any,
+    ) -> None:
+        self._jwt = jwt_obj if jwt_obj is not None else api_jwt._jwt_global_obj
+        self._jws = jws_obj if jws_obj is not None else self._jwt._jws
+        self.algorithms = algorithms
+        self.options = options
+        self.audience = audience
+        self.leeway = leeway
+        self._owns_transport = "transport" not in client_options
+        if self._owns_transport:
+            client_options["transport"] = KeepAliveTransport(
+                client_options.get("ssl_context")
+            )
+        self.client_options = client_options
+        # Transports created for issuers with their own ssl_context.
+        self._issuer_transports: list[KeepAliveTransport] = []
+
+        self._configs: dict[str, IssuerConfig] = {}
+        self._clients: dict[str, PyJWKClient] = {}
+        self._lock = threading.Lock()
+        for issuer, config in (issuers or {}).items():
+            self.add_issuer(issuer, config)
+
+    @property
+    def issuers(self) -> list[str]:
+        return list(self._configs)
+
+    def add_issuer(self, issuer: str, config: IssuerConfig) -> None:
+        """
+        Accepts tokens from ``issuer``, verified with the keys of ``config``
+        (a JWKS URI, a dict of :class:`PyJWKClient` arguments or a client).
+        Replaces the client of an already known issuer.
+        """
+        if not isinstance(issuer, str):
+            raise TypeError("issuer must be a string")
+        if isinstance(config, Mapping) and "uri" not in config:
+            raise TypeError(f'The configuration of "{issuer}" has no "uri"')
+        if not isinstance(config, (str, Mapping, PyJWKClient)):
+            raise TypeError(
+                "issuer configuration must be a URI, a dict or a PyJWKClient"
+            )
+
+        with self._lock:
+            self._configs[issuer] = config
+            self._clients.pop(issuer, None)
+
+    def remove_issuer(self, issuer: str) -> None:
+        with self._lock:
+            self._configs.pop(issuer, None)
+            self._clients.pop(issuer, None)
+
+    def get_client(self, issuer: str) -> PyJWKClient:
+        """
+        Returns the client of ``issuer``, creating it on first use. Raises
+        :class:`InvalidIssuerError` for unknown issuers.
+        """
+        client = self._clients.get(issuer) if isinstance(issuer, str) else None
+        if client is not None:
+            return client
+
+        with self._lock:
+            client = self._clients.get(issuer)
+            if client is not None:
+                return client
+            try:
+                config = self._configs[issuer]
+            except (KeyError, TypeError):
+                raise InvalidIssuerError("Invalid issuer") from None
+            client = self._create_client(config)
+            self._clients[issuer] = client
+            return client
+
+    def close(self) -> None:
+        """
+        Closes the idle connections of the transports the router created.
+        """
+        if self._owns_transport:
+            self.client_options["transport"].close()
+        for transport in self._issuer_transports:
+            transport.close()
+
+    def _create_client(self, config: IssuerConfig) -> PyJWKClient:
+        if isinstance(config, PyJWKClient):
+            return config
+        if isinstance(config, str):
+            return PyJWKClient(config, **self.client_options)
+
+        options = {**self.client_options, **config}
+        if (
+            self._owns_transport
+            and "ssl_context" in config
+            and "transport" not in config
+        ):
+            # The shared transport connects with the router's ssl_context.
+            transport = KeepAliveTransport(config["ssl_context"])
+            self._issuer_transports.append(transport)
+            options["transport"] = transport
+        return PyJWKClient(**options)
+
+    def get_signing_key_from_jwt(self, token: str | bytes) -> PyJWK:
+        """
+        Returns the key of the token's issuer matching its ``kid`` header,
+        without verifying the token.
+        """
+        _, _, header, _, issuer = self._load(token)
+        return self._get_signing_key(self.get_client(issuer), header)
+
+    def decode_complete(
+        self,
+        jwt: str | bytes,
+        algorithms: Sequence[str] | None = None,
+        options: dict[str, Any] | None = None,
+        audience: str | Iterable[str] | None = None,
+        subject: str | None = None,
+        leeway: float | timedelta | None = None,
+    ) -> dict[str, Any]:
+        """
+        Verifies ``jwt`` with the keys of its issuer and returns the decoded
+        header, payload and signature, like :func:`jwt.decode_complete`.
+        Arguments left as None default to those given to the router; without
+        ``algorithms``, the ``alg`` of the matching JWK is required.
+        """
+        if algorithms is None:
+            algorithms = self.algorithms
+        if options is None:
+            options = self.options
+        if audience is None:
+            audience = self.audience
+        if leeway is None:
+            leeway = self.leeway
+
+        options = self._jwt._normalize_options(options)
+        merged_options = {**self._jwt.options, **options}
+
+        payload, signing_input, header, signature, issuer = self._load(jwt)
+
+        client = self.get_client(issuer)
+        if merged_options["verify_signature"]:
+            key = self._get_signing_key(client, header)
+            self._jws._verify_signature(
+                signing_input, header, signature, key, algorithms
+            )
+
+        self._jwt._validate_claims(
+            payload,
+            merged_options,
+            audience=audience,
+            issuer=issuer,
+            subject=subject,
+            leeway=leeway,
+        )
+
+        return {
+            "payload": payload,
+            "header": header,
+            "signature": signature,
+        }
+
+    def decode(
+        self,
+        jwt: str | bytes,
+        algorithms: Sequence[str] | None = None,
+        options: dict[str, Any] | None = None,
+        audience: str | Iterable[str] | None = None,
+        subject: str | None = None,
+        leeway: float | timedelta | None = None,
+    ) -> Any:
+        """
+        Verifies ``jwt`` with the keys of its issuer and returns its payload,
+        like :func:`jwt.decode`.
+        """
+        return self.decode_complete(
+            jwt, algorithms, options, audience, subject, leeway
+        )["payload"]
+
+    @staticmethod
+    def _get_signing_key(client: PyJWKClient, header: dict[str, Any]) -> PyJWK:
+        kid = header.get("kid")
+        if not isinstance(kid, str):
+            # would match no key, after refetching the JWKS
+            raise PyJWKClientError(
+                f'Unable to find a signing key that matches: "{kid}"'
+            )
+        return client.get_signing_key(kid)
+
+    def _load(
+        self, jwt: str | bytes
+    ) -> tuple[dict[str, Any], bytes, dict[str, Any], bytes, str]:
+        raw_payload, signing_input, header, signature = self._jws._load(jwt)
+        if header.get("b64", True) is False:
+            raise DecodeError("Tokens with a detached payload are not supported")
+
+        payload = self._jwt._decode_payload({"payload": raw_payload})
+        issuer = payload.get("iss")
+        if issuer is None:
+            raise MissingRequiredClaimError("iss")
+        if not isinstance(issuer, str):
+            raise InvalidIssuerError("Invalid issuer")
+
+        return payload, signing_input, header, signature, issuer
@@ -0,0 +1,60 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Tuple
+
+
+class PreparedKeyCache:
+    """
+    Bounded LRU cache of prepared key objects.
+
+    Entries are keyed by the algorithm family and a SHA-256 digest of the
+    serialized key, so the same PEM or SSH key is only parsed once.
+    """
+
+    def __init__(self, maxsize: int = 64, enabled: bool = True) -> None:
+        if maxsize <= 0:
+            raise ValueError(
+                f'maxsize must be greater than 0, the input is "{maxsize}"'
+            )
+        self.maxsize = maxsize
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[Hashable, bytes], Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_prepare(
+        self, family: Hashable, key_bytes: bytes, prepare: Callable[[bytes], Any]
+    ) -> Any:
+        if not self.enabled:
+            return prepare(key_bytes)
+
+        cache_key = (family, hashlib.sha256(key_bytes).digest())
+        with self._lock:
+            prepared = self._entries.get(cache_key)
+            if prepared is not None:
+                self._entries.move_to_end(cache_key)
+                self.hits += 1
+                return prepared
+            self.misses += 1
+
+        # Parse outside the lock; failures propagate and are not cached.
+        prepared = prepare(key_bytes)
+
+        with self._lock:
+            self._entries[cache_key] = prepared
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+        return prepared
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,229 @@
+"""
+Token revocation by ``jti``, checked by :class:`PyJWT` after the claims of a
+token are validated when it is given a ``revocation_store``.
+
+Example usage:
+
+>>> store = jwt.ShardedRevocationStore()
+>>> jwt_obj = jwt.PyJWT(revocation_store=store)
+>>> store.revoke_token(jwt_obj.decode(token, key, ["HS256"]))
+>>> jwt_obj.decode(token, key, ["HS256"])  # raises RevokedTokenError
+"""
+
+from __future__ import annotations
+
+import hashlib
+import heapq
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Iterable
+from typing import Any
+
+
+class RevocationStore(ABC):
+    """
+    Base class of revocation stores. Subclasses backed by a database or a
+    cache service implement :meth:`is_revoked` and :meth:`revoke`.
+    """
+
+    @abstractmethod
+    def is_revoked(self, jti: str) -> bool:
+        """
+        Returns True if the token with the given ``jti`` has been revoked.
+        """
+
+    @abstractmethod
+    def revoke(self, jti: str, expires_at: float | None = None) -> None:
+        """
+        Revokes the token with the given ``jti``. The revocation may be
+        forgotten after ``expires_at`` (a Unix timestamp, normally the
+        token's ``exp``), once the token is rejected as expired anyway.
+        """
+
+    def revoke_token(self, payload: dict[str, Any]) -> None:
+        """
+        Revokes a decoded token until its ``exp`` claim.
+        """
+        jti = payload.get("jti")
+        if not isinstance(jti, str):
+            raise ValueError("The token has no jti claim to revoke")
+        exp = payload.get("exp")
+        self.revoke(jti, exp if isinstance(exp, (int, float)) else None)
+
+
+class ShardedRevocationStore(RevocationStore):
+    """
+    In-memory revocation store. Revoked ``jti`` values are spread over
+    ``shards`` dicts, each with its own lock for writers, and are evicted
+    once their token has expired. Lookups take no lock, so checking a
+    token that isn't revoked costs one hash and one dict lookup.
+
+    Revocations are kept ``leeway`` seconds past ``expires_at``; set it to
+    the largest ``leeway`` used when decoding, so an expired token accepted
+    within the leeway is still rejected. Revocations without ``expires_at``
+    are kept for ``default_ttl`` seconds, or until :meth:`unrevoke` if it
+    is None.
+    """
+
+    def __init__(
+        self,
+        shards: int = 16,
+        leeway: float = 0,
+        default_ttl: float | None = None,
+    ) -> None:
+        if shards <= 0:
+            raise ValueError(f'shards must be greater than 0, the input is "{shards}"')
+        self.leeway = leeway
+        self.default_ttl = default_ttl
+        self._shards: list[dict[str, float]] = [{} for _ in range(shards)]
+        # (expires_at, jti) min-heaps, popped on writes to evict expired
+        # revocations.
+        self._expiries: list[list[tuple[float, str]]] = [[] for _ in range(shards)]
+        self._locks = [threading.Lock() for _ in range(shards)]
+
+    def is_revoked(self, jti: str) -> bool:
+        shards = self._shards
+        expires_at = shards[hash(jti) % len(shards)].get(jti)
+        return expires_at is not None and time.time() < expires_at
+
+    def revoke(self, jti: str, expires_at: float | None = None) -> None:
+        now = time.time()
+        if expires_at is not None:
+            expires_at += self.leeway
+        elif self.default_ttl is not None:
+            expires_at = now + self.default_ttl
+        else:
+            expires_at = math.inf
+
+        index = hash(jti) % len(self._shards)
+        shard = self._shards[index]
+        with self._locks[index]:
+            self._evict(index, now)
+            current = shard.get(jti)
+            if current is not None and current >= expires_at:
+                return
+            shard[jti] = expires_at
+            if expires_at != math.inf:
+                heapq.heappush(self._expiries[index], (expires_at, jti))
+
+    def unrevoke(self, jti: str) -> None:
+        index = hash(jti) % len(self._shards)
+        with self._locks[index]:
+            self._shards[index].pop(jti, None)
+
+    def purge(self) -> None:
+        """
+        Evicts the expired revocations of every shard. Writes already evict
+        those of the shard they touch.
+        """
+        now = time.time()
+        for index, lock in enumerate(self._locks):
+            with lock:
+                self._evict(index, now)
+
+    def _evict(self, index: int, now: float) -> None:
+        expiries = self._expiries[index]
+        shard = self._shards[index]
+        while expiries and expiries[0][0] <= now:
+            expires_at, jti = heapq.heappop(expiries)
+            # skip entries superseded by a later revoke() of the same jti
+            if shard.get(jti) == expires_at:
+                del shard[jti]
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+
+class BloomFilter:
+    """
+    Set membership with false positives but no false negatives, in about
+    ``-capacity * ln(error_rate) / ln(2)**2`` bits. Items can't be removed.
+    """
+
+    def __init__(self, capacity: int = 100_000, error_rate: float = 0.001) -> None:
+        if capacity <= 0:
+            raise ValueError(
+                f'capacity must be greater than 0, the input is "{capacity}"'
+            )
+        if not 0 < error_rate < 1:
+            raise ValueError(
+                f'error_rate must be between 0 and 1, the input is "{error_rate}"'
+            )
+        self.size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> list[int]:
+        # Double hashing of one 128-bit digest (Kirsch and Mitzenmacher).
+        digest = hashlib.blake2b(
+            item.encode("utf-8", "surrogatepass"), digest_size=16
+        ).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        size = self.size
+        return [(h1 + i * h2) % size for i in range(self.hash_count)]
+
+    def add(self, item: str) -> None:
+        bits = self._bits
+        for position in self._positions(item):
+            bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        bits = self._bits
+        for position in self._positions(item):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    def clear(self) -> None:
+        self._bits = bytearray(len(self._bits))
+
+
+class BloomFilteredRevocationStore(RevocationStore):
+    """
+    Puts a :class:`BloomFilter` of the revoked ``jti`` values in front of a
+    slower store, such as a database, so tokens that were never revoked are
+    accepted without querying it. Only bloom filter hits reach ``store``.
+
+    The filter must see every revocation: through :meth:`revoke`, or with
+    :meth:`load` for revocations made elsewhere (e.g. by other processes
+    sharing the database). Expired revocations stay in the filter, which
+    only costs extra queries; :meth:`load` with ``reset=True`` rebuilds it.
+    """
+
+    def __init__(
+        self,
+        store: RevocationStore,
+        capacity: int = 100_000,
+        error_rate: float = 0.001,
+    ) -> None:
+        self.store = store
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.bloom_filter = BloomFilter(capacity, error_rate)
+
+    def is_revoked(self, jti: str) -> bool:
+        if jti not in self.bloom_filter:
+            return False
+        return self.store.is_revoked(jti)
+
+    def revoke(self, jti: str, expires_at: float | None = None) -> None:
+        # added first, so a concurrent check can't miss a stored revocation
+        self.bloom_filter.add(jti)
+        self.store.revoke(jti, expires_at)
+
+    def load(self, jtis: Iterable[str], reset: bool = False) -> None:
+        """
+        Adds revocations already in ``store`` to the filter. With ``reset``,
+        a new filter is built from ``jtis`` alone.
+        """
+        if reset:
+            bloom_filter = BloomFilter(self.capacity, self.error_rate)
+        else:
+            bloom_filter = self.bloom_filter
+        for jti in jtis:
+            bloom_filter.add(jti)
+        # swapped in once complete, so checks never see a partial filter
+        self.bloom_filter = bloom_filter
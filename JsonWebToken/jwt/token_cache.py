@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import copy
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+from .utils import force_bytes
+
+_IMMUTABLE_TYPES = frozenset({str, int, float, bool, type(None), bytes})
+
+
+def _copy_decoded(value: Any) -> Any:
+    """
+    Returns a deep copy of a decoded header or payload, so callers can't
+    change a cached entry through the value they got. Only the dicts and
+    lists of the JSON data are walked; other objects go to copy.deepcopy.
+    """
+    value_type = type(value)
+    if value_type is dict:
+        if set(map(type, value.values())) <= _IMMUTABLE_TYPES:
+            return value.copy()
+        return {k: _copy_decoded(v) for k, v in value.items()}
+    if value_type is list:
+        if set(map(type, value)) <= _IMMUTABLE_TYPES:
+            return value.copy()
+        return [_copy_decoded(v) for v in value]
+    if value_type in _IMMUTABLE_TYPES:
+        return value
+    return copy.deepcopy(value)
+
+
+class _Entry:
+    __slots__ = ("decoded", "expires_at", "key")
+
+    def __init__(self, decoded: dict[str, Any], key: Any, expires_at: float) -> None:
+        self.decoded = decoded
+        self.key = key
+        self.expires_at = expires_at
+
+
+class VerifiedTokenCache:
+    """
+    Bounded cache of successfully verified tokens, for :class:`PyJWT`.
+
+    Entries are keyed by a SHA-256 digest of the token and the verification
+    configuration (key, algorithms, options and claim checks). An entry is
+    dropped when the token's ``exp`` is reached, or after ``max_ttl`` seconds
+    if that comes first, so an expired token is never served from the cache.
+    Key objects (including :class:`PyJWK`) are matched by identity, so a key
+    set refresh that replaces a key invalidates the entries verified with the
+    old one, while entries of unchanged (reused) keys stay valid.
+
+    ``on_event`` is called with ``"hit"``, ``"miss"``, ``"expired"`` or
+    ``"evicted"`` for each corresponding cache event.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        max_ttl: float = 300,
+        on_event: Callable[[str], None] | None = None,
+    ) -> None:
+        if maxsize <= 0:
+            raise ValueError(
+                f'maxsize must be greater than 0, the input is "{maxsize}"'
+            )
+        self.maxsize = maxsize
+        self.max_ttl = max_ttl
+        self.on_event = on_event
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def make_key(self, jwt: str | bytes, key: Any, config: tuple[Any, ...]) -> Hashable:
+        if isinstance(key, (str, bytes)):
+            key_id: Any = hashlib.sha256(force_bytes(key)).digest()
+        else:
+            key_id = id(key)
+        return (hashlib.sha256(force_bytes(jwt)).digest(), key_id, repr(config))
+
+    def get(self, cache_key: Hashable, key: Any) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is None:
+                self.misses += 1
+                event = "miss"
+            elif time.time() >= entry.expires_at:
+                del self._entries[cache_key]
+                self.expirations += 1
+                self.misses += 1
+                event = "expired"
+            elif not isinstance(key, (str, bytes)) and entry.key is not key:
+                self.misses += 1
+                event = "miss"
+            else:
+                self._entries.move_to_end(cache_key)
+                self.hits += 1
+                event = "hit"
+
+        if self.on_event is not None:
+            self.on_event(event)
+        if event != "hit":
+            return None
+
+        return _copy_decoded(entry.decoded)  # type: ignore[union-attr]
+
+    def put(self, cache_key: Hashable, key: Any, decoded: dict[str, Any]) -> None:
+        now = time.time()
+        expires_at = now + self.max_ttl
+        exp = decoded["payload"].get("exp")
+        if exp is not None:
+            try:
+                expires_at = min(expires_at, float(exp))
+            except (TypeError, ValueError):
+                return
+        if expires_at <= now:
+            return
+
+        evicted = 0
+        with self._lock:
+            self._entries[cache_key] = _Entry(
+                _copy_decoded(decoded),
+                None if isinstance(key, (str, bytes)) else key,
+                expires_at,
+            )
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                evicted += 1
+            self.evictions += evicted
+
+        if self.on_event is not None:
+            for _ in range(evicted):
+                self.on_event("evicted")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
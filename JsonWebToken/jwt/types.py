@@ -1,5 +1,8 @@
-from typing import Any, Callable, Dict
+from typing import Any, Callable, Dict, Union
 
 JWKDict = Dict[str, Any]
 
 HashlibHash = Callable[..., Any]
+
+# A chunk of a streamed payload (see PyJWS.encode_detached_stream).
+PayloadChunk = Union[bytes, bytearray, memoryview]
@@ -1,16 +1,11 @@
 import base64
 import binascii
+import functools
 import re
-from typing import Optional, Union
+from typing import TYPE_CHECKING, Any, Callable, Iterable, List, Optional, Tuple, Union
 
-try:
+if TYPE_CHECKING:
     from cryptography.hazmat.primitives.asymmetric.ec import EllipticCurve
-    from cryptography.hazmat.primitives.asymmetric.utils import (
-        decode_dss_signature,
-        encode_dss_signature,
-    )
-except ModuleNotFoundError:
-    pass
 
 
 def force_bytes(value: Union[bytes, str]) -> bytes:
@@ -22,15 +17,18 @@ def force_bytes(value: Union[bytes, str]) -> bytes:
         raise TypeError("Expected a string value")
 
 
-def base64url_decode(input: Union[bytes, str]) -> bytes:
-    input_bytes = force_bytes(input)
+_URLSAFE_TO_STANDARD = bytes.maketrans(b"-_", b"+/")
+_PADDING = (b"", b"===", b"==", b"=")
 
-    rem = len(input_bytes) % 4
 
-    if rem > 0:
-        input_bytes += b"=" * (4 - rem)
+def base64url_decode(input: Union[bytes, str]) -> bytes:
+    input_bytes = force_bytes(input)
 
-    return base64.urlsafe_b64decode(input_bytes)
+    # Same as base64.urlsafe_b64decode on the padded input, with one copy
+    # of the input instead of three.
+    return binascii.a2b_base64(
+        input_bytes.translate(_URLSAFE_TO_STANDARD) + _PADDING[len(input_bytes) % 4]
+    )
 
 
 def base64url_encode(input: bytes) -> bytes:
@@ -55,12 +53,11 @@ def from_base64url_uint(val: Union[bytes, str]) -> int:
 
 
 def number_to_bytes(num: int, num_bytes: int) -> bytes:
-    padded_hex = "%0*x" % (2 * num_bytes, num)
-    return binascii.a2b_hex(padded_hex.encode("ascii"))
+    return num.to_bytes(num_bytes, "big")
 
 
 def bytes_to_number(string: bytes) -> int:
-    return int(binascii.b2a_hex(string), 16)
+    return int.from_bytes(string, "big")
 
 
 def bytes_from_int(val: int, *, bit_length: Optional[int] = None) -> bytes:
@@ -71,28 +68,83 @@ def bytes_from_int(val: int, *, bit_length: Optional[int] = None) -> bytes:
     return val.to_bytes(byte_length, "big", signed=False)
 
 
+@functools.lru_cache(maxsize=None)
+def _dss_codec() -> Tuple[Callable[[bytes], Tuple[int, int]], Callable[..., Any]]:
+    # Imported once on first use, so importing jwt doesn't require
+    # cryptography.
+    from cryptography.hazmat.primitives.asymmetric.utils import (
+        decode_dss_signature,
+        encode_dss_signature,
+    )
+
+    return decode_dss_signature, encode_dss_signature
+
+
+def _curve_num_bytes(curve: "EllipticCurve") -> int:
+    return (curve.key_size + 7) // 8
+
+
 def der_to_raw_signature(der_sig: bytes, curve: "EllipticCurve") -> bytes:
-    num_bits = curve.key_size
-    num_bytes = (num_bits + 7) // 8
+    num_bytes = _curve_num_bytes(curve)
+    decode_dss_signature = _dss_codec()[0]
 
     r, s = decode_dss_signature(der_sig)
 
-    return number_to_bytes(r, num_bytes) + number_to_bytes(s, num_bytes)
+    return r.to_bytes(num_bytes, "big") + s.to_bytes(num_bytes, "big")
 
 
 def raw_to_der_signature(raw_sig: bytes, curve: "EllipticCurve") -> bytes:
-    num_bits = curve.key_size
-    num_bytes = (num_bits + 7) // 8
+    num_bytes = _curve_num_bytes(curve)
 
     if len(raw_sig) != 2 * num_bytes:
         raise ValueError("Invalid signature")
 
-    r = bytes_to_number(raw_sig[:num_bytes])
-    s = bytes_to_number(raw_sig[num_bytes:])
+    r = int.from_bytes(raw_sig[:num_bytes], "big")
+    s = int.from_bytes(raw_sig[num_bytes:], "big")
 
+    encode_dss_signature = _dss_codec()[1]
     return bytes(encode_dss_signature(r, s))
 
 
+def der_to_raw_signatures(
+    der_sigs: Iterable[bytes], curve: "EllipticCurve"
+) -> List[bytes]:
+    """
+    Converts many DER signatures made with the same curve, as
+    :func:`der_to_raw_signature` would one at a time.
+    """
+    num_bytes = _curve_num_bytes(curve)
+    decode_dss_signature = _dss_codec()[0]
+
+    raw_sigs = []
+    for der_sig in der_sigs:
+        r, s = decode_dss_signature(der_sig)
+        raw_sigs.append(r.to_bytes(num_bytes, "big") + s.to_bytes(num_bytes, "big"))
+    return raw_sigs
+
+
+def raw_to_der_signatures(
+    raw_sigs: Iterable[bytes], curve: "EllipticCurve"
+) -> List[bytes]:
+    """
+    Converts many raw (r || s) signatures made with the same curve, as
+    :func:`raw_to_der_signature` would one at a time. Raises ``ValueError``
+    if any of them has the wrong length.
+    """
+    num_bytes = _curve_num_bytes(curve)
+    sig_len = 2 * num_bytes
+    encode_dss_signature = _dss_codec()[1]
+
+    der_sigs = []
+    for raw_sig in raw_sigs:
+        if len(raw_sig) != sig_len:
+            raise ValueError("Invalid signature")
+        r = int.from_bytes(raw_sig[:num_bytes], "big")
+        s = int.from_bytes(raw_sig[num_bytes:], "big")
+        der_sigs.append(bytes(encode_dss_signature(r, s)))
+    return der_sigs
+
+
 # Based on https://github.com/hynek/pem/blob/7ad94db26b0bc21d10953f5dbad3acfdfacf57aa/src/pem/_core.py#L224-L252
 _PEMS = {
     b"CERTIFICATE",
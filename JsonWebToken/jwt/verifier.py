@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Iterable, Sequence
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any
+
+from . import api_jws, api_jwt
+from .algorithms import Algorithm
+from .api_jwk import PyJWK
+from .exceptions import (
+    DecodeError,
+    InvalidAudienceError,
+    MissingRequiredClaimError,
+    PyJWTError,
+)
+
+if TYPE_CHECKING:
+    from .algorithms import AllowedPublicKeys
+
+
+class Verifier:
+    """
+    Verifies tokens against a fixed key, algorithm and claim configuration.
+
+    Everything :func:`jwt.decode` recomputes on each call (merged options,
+    allowed algorithms, prepared key, audience set, leeway) is computed once
+    here, so :meth:`verify` only does the per-token work.
+
+    Example usage:
+
+    >>> verifier = jwt.Verifier(key, ["RS256"], audience="api", issuer="idp")
+    >>> payload = verifier.verify(token)
+    """
+
+    def __init__(
+        self,
+        key: AllowedPublicKeys | PyJWK | str | bytes,
+        algorithms: Sequence[str] | None = None,
+        options: dict[str, Any] | None = None,
+        audience: str | Iterable[str] | None = None,
+        issuer: str | Sequence[str] | None = None,
+        subject: str | None = None,
+        leeway: float | timedelta = 0,
+        jwt_obj: api_jwt.PyJWT | None = None,
+        jws_obj: api_jws.PyJWS | None = None,
+    ) -> None:
+        self._jwt = jwt_obj if jwt_obj is not None else api_jwt._jwt_global_obj
+        self._jws = jws_obj if jws_obj is not None else self._jwt._jws
+
+        options = self._jwt._normalize_options(options)
+        self.options: dict[str, Any] = {**self._jwt.options, **options}
+        self._verify_signature = self.options["verify_signature"]
+
+        if algorithms is None and isinstance(key, PyJWK):
+            algorithms = [key.algorithm_name]
+        if self._verify_signature and not algorithms:
+            raise DecodeError(
+                'It is required that you pass in a value for the "algorithms" argument when calling decode().'
+            )
+        self.key = key
+        self.algorithms: frozenset[str] = frozenset(algorithms or ())
+        self._prepared_keys = self._prepare_keys()
+
+        if audience is not None and not isinstance(audience, (str, Iterable)):
+            raise TypeError("audience must be a string, iterable or None")
+        self.audience = audience
+        self._audience_set: frozenset[str] | None = None
+        if audience is not None:
+            self._audience_set = frozenset(
+                [audience] if isinstance(audience, str) else audience
+            )
+
+        self.issuer = (
+            issuer if issuer is None or isinstance(issuer, str) else tuple(issuer)
+        )
+        self.subject = subject
+        self.leeway = (
+            leeway.total_seconds() if isinstance(leeway, timedelta) else leeway
+        )
+        self.required_claims: tuple[str, ...] = tuple(self.options["require"])
+        self._strict_aud = self.options.get("strict_aud", False)
+
+    def _prepare_keys(self) -> dict[str, tuple[Algorithm, Any]]:
+        prepared_keys: dict[str, tuple[Algorithm, Any]] = {}
+        if not self._verify_signature or isinstance(self.key, PyJWK):
+            # A PyJWK already carries its algorithm and prepared key.
+            return prepared_keys
+
+        for alg in self.algorithms:
+            try:
+                alg_obj = self._jws.get_algorithm_by_name(alg)
+                prepared_keys[alg] = (alg_obj, alg_obj.prepare_key(self.key))
+            except (NotImplementedError, PyJWTError):
+                # Leave it to verification time, so the error is raised only
+                # for tokens that actually use this algorithm.
+                continue
+
+        return prepared_keys
+
+    def verify_complete(self, jwt: str | bytes) -> dict[str, Any]:
+        """
+        Verifies ``jwt`` and returns the decoded header, payload and
+        signature, like :func:`jwt.decode_complete`.
+        """
+        decoded = self._jws._decode_loaded(
+            jwt,
+            self.key,
+            self.algorithms,  # type: ignore[arg-type]
+            self._verify_signature,
+            None,
+            prepared_keys=self._prepared_keys,
+        )
+        payload = self._jwt._decode_payload(decoded)
+        self._validate_claims(payload)
+
+        decoded["payload"] = payload
+        return decoded
+
+    def verify(self, jwt: str | bytes) -> Any:
+        """
+        Verifies ``jwt`` and returns its payload, like :func:`jwt.decode`.
+        """
+        return self.verify_complete(jwt)["payload"]
+
+    def _validate_claims(self, payload: dict[str, Any]) -> None:
+        options = self.options
+        jwt_obj = self._jwt
+
+        for claim in self.required_claims:
+            if payload.get(claim) is None:
+                raise MissingRequiredClaimError(claim)
+
+        now = time.time()
+
+        if "iat" in payload and options["verify_iat"]:
+            jwt_obj._validate_iat(payload, now, self.leeway)
+
+        if "nbf" in payload and options["verify_nbf"]:
+            jwt_obj._validate_nbf(payload, now, self.leeway)
+
+        if "exp" in payload and options["verify_exp"]:
+            jwt_obj._validate_exp(payload, now, self.leeway)
+
+        if options["verify_iss"]:
+            jwt_obj._validate_iss(payload, self.issuer)
+
+        if options["verify_aud"]:
+            self._validate_aud(payload)
+
+        if options["verify_sub"]:
+            jwt_obj._validate_sub(payload, self.subject)
+
+        if options["verify_jti"]:
+            jwt_obj._validate_jti(payload)
+
+        if jwt_obj.revocation_store is not None:
+            jwt_obj._validate_revocation(payload)
+
+    def _validate_aud(self, payload: dict[str, Any]) -> None:
+        if self._audience_set is None or self._strict_aud:
+            self._jwt._validate_aud(payload, self.audience, strict=self._strict_aud)
+            return
+
+        if "aud" not in payload or not payload["aud"]:
+            # Application specified an audience, but it could not be
+            # verified since the token does not contain a claim.
+            raise MissingRequiredClaimError("aud")
+
+        audience_claims = payload["aud"]
+        if isinstance(audience_claims, str):
+            audience_claims = [audience_claims]
+        if not isinstance(audience_claims, list):
+            raise InvalidAudienceError("Invalid claim format in token")
+        if any(not isinstance(c, str) for c in audience_claims):
+            raise InvalidAudienceError("Invalid claim format in token")
+
+        if self._audience_set.isdisjoint(audience_claims):
+            raise InvalidAudienceError("Audience doesn't match")